@@ -0,0 +1,124 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Memory and probe-speed comparison of the slotted entry and node types
+#              against equivalent classes with a per-instance __dict__
+
+import argparse
+import time
+import tracemalloc
+
+from hash_map_include import HashChain, HashEntry, HashNode
+
+
+class DictHashEntry:
+    def __init__(self, key: str, value: object, hash_val: int) -> None:
+        """
+        HashEntry without __slots__, for comparison
+        """
+        self.key = key
+        self.value = value
+        self.hash = hash_val
+        self.is_tombstone = False
+
+
+class DictHashNode:
+    def __init__(self, key: str, value: object, hash_val: int, next=None) -> None:
+        """
+        HashNode without __slots__, for comparison
+        """
+        self.next = next
+        self.key = key
+        self.value = value
+        self.hash = hash_val
+
+
+def measure_memory(build: callable) -> (object, int):
+    """
+    This function returns the result of build() and the number of bytes it left allocated.
+
+    :params: build: a callable taking no arguments
+
+    :return: a tuple of the built object and its allocated size in bytes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def probe_entries(entries: list, keys: list, rounds: int) -> float:
+    """
+    This function times the attribute reads an open addressing probe does per bucket.
+
+    :params: entries: the entries to probe
+             keys: the key each probe is looking for
+             rounds: the number of passes over the entries
+
+    :return: the elapsed time in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index in range(len(entries)):
+            entry = entries[index]
+            if entry.is_tombstone is False and entry.hash == index and entry.key == keys[index]:
+                entry.value
+    return time.perf_counter() - start
+
+
+def walk_chain(head: object, rounds: int) -> float:
+    """
+    This function times a full walk along a chain of nodes, comparing hashes and keys.
+
+    :params: head: the first node of the chain
+             rounds: the number of walks
+
+    :return: the elapsed time in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        node = head
+        while node is not None:
+            if node.hash == -1 and node.key == '':
+                break
+            node = node.next
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Run the comparison and print one line per measurement
+    """
+    parser = argparse.ArgumentParser(description='Compare slotted and __dict__ entry types')
+    parser.add_argument('-n', type=int, default=200000, help='number of entries / nodes')
+    parser.add_argument('-r', type=int, default=5, help='probe rounds')
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.n)]
+
+    print(f"{'type':<16}{'bytes/item':>12}{'probe s':>12}")
+    for name, cls in (('DictHashEntry', DictHashEntry), ('HashEntry', HashEntry)):
+        entries, size = measure_memory(lambda: [cls(key, i, i) for i, key in enumerate(keys)])
+        elapsed = probe_entries(entries, keys, args.r)
+        print(f"{name:<16}{size / args.n:>12.1f}{elapsed:>12.3f}")
+
+    for name, cls in (('DictHashNode', DictHashNode), ('HashNode', HashNode)):
+        def build():
+            head = None
+            for i, key in enumerate(keys):
+                head = cls(key, i, i, head)
+            return head
+        head, size = measure_memory(build)
+        elapsed = walk_chain(head, args.r)
+        print(f"{name:<16}{size / args.n:>12.1f}{elapsed:>12.3f}")
+
+    chains, size = measure_memory(lambda: [HashChain() for _ in range(args.n)])
+    print(f"{'HashChain':<16}{size / args.n:>12.1f}{'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
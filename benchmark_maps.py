@@ -0,0 +1,337 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Benchmark of the hash map implementations across hash functions, workload
+#              mixes and sizes, reporting throughput, latency percentiles and peak memory
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_oa_compact
+import hash_map_sc
+import hash_map_sc_flat
+from a6_include import hash_function_1, hash_function_2
+
+MAPS = {
+    'oa': hash_map_oa.HashMap,
+    'sc': hash_map_sc.HashMap,
+    'oa_compact': hash_map_oa_compact.HashMap,
+    'sc_flat': hash_map_sc_flat.HashMap,
+}
+
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+}
+
+# operation codes of a workload
+PUT = 0
+GET = 1
+REMOVE = 2
+
+
+def make_keys(count: int, offset: int = 0) -> list:
+    """
+    Return count distinct keys, numbered from offset
+    """
+    return ['key' + str(i) for i in range(offset, offset + count)]
+
+
+def adversarial_keys(count: int, function: callable) -> list:
+    """
+    This function returns count distinct keys that collide as much as possible under the given
+    hash function. Candidates are grouped by their full hash and taken from the largest groups
+    first, so every key of a group lands in the same bucket whatever the capacity.
+
+    :params: count: the number of keys
+             function: the hash function the keys should collide under
+
+    :return: a list of keys
+    """
+    groups = {}
+    for key in make_keys(4 * count):
+        groups.setdefault(function(key), []).append(key)
+
+    keys = []
+    for group in sorted(groups.values(), key=len, reverse=True):
+        keys.extend(group[:count - len(keys)])
+        if len(keys) == count:
+            break
+    return keys
+
+
+def build_workload(name: str, count: int, function: callable, rnd: random.Random) -> (list, list):
+    """
+    This function builds a workload: the keys loaded before measuring, and the measured
+    operations as (operation code, key) tuples.
+
+    insert        count puts of new keys
+    read_heavy    count operations on count loaded keys: 90% gets (a tenth of them misses),
+                  10% puts
+    delete_churn  count operations alternating a remove of a loaded key and a put of a new one
+    zipf          count gets of loaded keys drawn from a Zipf distribution (exponent 1.1)
+    adversarial   count puts then count gets of keys that share a handful of hash values
+
+    :params: name: the workload name
+             count: the number of keys, and of measured operations
+             function: the hash function of the map under test
+             rnd: the random source
+
+    :return: a tuple of the keys to preload and the list of operations
+    """
+    if name == 'insert':
+        return [], [(PUT, key) for key in make_keys(count)]
+
+    if name == 'adversarial':
+        keys = adversarial_keys(count, function)
+        return [], [(PUT, key) for key in keys] + [(GET, key) for key in keys]
+
+    loaded = make_keys(count)
+
+    if name == 'read_heavy':
+        missing = make_keys(count, count)
+        ops = []
+        for _ in range(count):
+            roll = rnd.random()
+            if roll < 0.09:
+                ops.append((GET, rnd.choice(missing)))
+            elif roll < 0.9:
+                ops.append((GET, rnd.choice(loaded)))
+            else:
+                ops.append((PUT, rnd.choice(loaded)))
+        return loaded, ops
+
+    if name == 'delete_churn':
+        present = list(loaded)
+        fresh = iter(make_keys(count, count))
+        ops = []
+        for i in range(count):
+            if i % 2 == 0:
+                # swap the victim to the end so removal from the pool is O(1)
+                victim = rnd.randrange(len(present))
+                present[victim], present[-1] = present[-1], present[victim]
+                ops.append((REMOVE, present.pop()))
+            else:
+                key = next(fresh)
+                present.append(key)
+                ops.append((PUT, key))
+        return loaded, ops
+
+    if name == 'zipf':
+        weights = [1 / rank ** 1.1 for rank in range(1, count + 1)]
+        cumulative = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+        return loaded, [(GET, key) for key in rnd.choices(loaded, cum_weights=cumulative, k=count)]
+
+    raise ValueError(f"unknown workload {name!r}")
+
+
+WORKLOADS = ('insert', 'read_heavy', 'delete_churn', 'zipf', 'adversarial')
+
+
+def run_ops(hash_map, ops: list, sample_every: int) -> (float, list):
+    """
+    This function applies the operations to the map, timing every sample_every-th operation
+    individually for the latency distribution.
+
+    :params: hash_map: the map under test
+             ops: a list of (operation code, key) tuples
+             sample_every: the spacing of the timed operations
+
+    :return: a tuple of the elapsed time in seconds and the sampled latencies in nanoseconds
+    """
+    put = hash_map.put
+    get = hash_map.get
+    remove = hash_map.remove
+    clock = time.perf_counter_ns
+    latencies = []
+
+    start = time.perf_counter()
+    for i, (op, key) in enumerate(ops):
+        if i % sample_every == 0:
+            before = clock()
+            if op == GET:
+                get(key)
+            elif op == PUT:
+                put(key, i)
+            else:
+                remove(key)
+            latencies.append(clock() - before)
+        elif op == GET:
+            get(key)
+        elif op == PUT:
+            put(key, i)
+        else:
+            remove(key)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, latencies
+
+
+def percentile(ordered: list, percent: float) -> float:
+    """
+    Return the value at the given percentile of a sorted list, 0 for an empty list
+    """
+    if len(ordered) == 0:
+        return 0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def peak_memory(map_class, function: callable, loaded: list, ops: list) -> int:
+    """
+    This function replays the preload and the operations on a fresh map under tracemalloc.
+
+    :params: map_class: the HashMap class under test
+             function: the hash function
+             loaded: the keys to preload
+             ops: the operations
+
+    :return: the peak number of bytes allocated while the map was built and used
+    """
+    tracemalloc.start()
+    hash_map = map_class(11, function)
+    for i, key in enumerate(loaded):
+        hash_map.put(key, i)
+    run_ops(hash_map, ops, len(ops) + 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_case(map_name: str, function_name: str, workload: str, count: int, seed: int,
+             sample_every: int, memory: bool) -> dict:
+    """
+    This function runs one benchmark case on a fresh map.
+
+    :params: map_name: a key of MAPS
+             function_name: a key of FUNCTIONS
+             workload: one of WORKLOADS
+             count: the workload size
+             seed: the random seed of the workload
+             sample_every: the spacing of the timed operations
+             memory: whether to replay the case under tracemalloc for its peak memory
+
+    :return: a dict of the case parameters and its measurements
+    """
+    map_class = MAPS[map_name]
+    function = FUNCTIONS[function_name]
+    loaded, ops = build_workload(workload, count, function, random.Random(seed))
+
+    hash_map = map_class(11, function)
+    for i, key in enumerate(loaded):
+        hash_map.put(key, i)
+    elapsed, latencies = run_ops(hash_map, ops, sample_every)
+    latencies.sort()
+
+    return {
+        'map': map_name,
+        'function': function_name,
+        'workload': workload,
+        'n': count,
+        'ops': len(ops),
+        'seconds': elapsed,
+        'ops_per_sec': len(ops) / elapsed if elapsed > 0 else 0.0,
+        'p50_us': percentile(latencies, 50) / 1000,
+        'p90_us': percentile(latencies, 90) / 1000,
+        'p99_us': percentile(latencies, 99) / 1000,
+        'max_us': (latencies[-1] if latencies else 0) / 1000,
+        'peak_bytes': peak_memory(map_class, function, loaded, ops) if memory else None,
+        'size': hash_map.get_size(),
+        'capacity': hash_map.get_capacity(),
+    }
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """
+    This function prints the throughput of every case relative to the same case in a JSON
+    report written by an earlier run, so a change can be judged against the baseline.
+
+    :params: results: the results of this run
+             baseline_path: the path of the earlier JSON report
+
+    :return: None
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    def case(result):
+        return result['map'], result['function'], result['workload'], result['n']
+
+    before = {case(result): result for result in baseline['results']}
+    print(f"\n{'map':<12}{'function':<17}{'workload':<14}{'n':>10}{'ops/s ratio':>13}"
+          f"{'p99 ratio':>11}")
+    for result in results:
+        old = before.get(case(result))
+        if old is None or old['ops_per_sec'] == 0:
+            continue
+        p99_ratio = result['p99_us'] / old['p99_us'] if old['p99_us'] > 0 else 0.0
+        print(f"{result['map']:<12}{result['function']:<17}{result['workload']:<14}"
+              f"{result['n']:>10}{result['ops_per_sec'] / old['ops_per_sec']:>13.2f}"
+              f"{p99_ratio:>11.2f}")
+
+
+def main() -> None:
+    """
+    Run every combination of the selected maps, hash functions, workloads and sizes, print one
+    line per case, and optionally write all results as JSON and compare them with a baseline
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the hash map implementations')
+    parser.add_argument('--maps', nargs='+', choices=sorted(MAPS), default=['oa', 'sc'])
+    parser.add_argument('--functions', nargs='+', choices=sorted(FUNCTIONS),
+                        default=sorted(FUNCTIONS))
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help='workload sizes, up to 10000000 (adversarial is quadratic)')
+    parser.add_argument('--seed', type=int, default=261, help='random seed of the workloads')
+    parser.add_argument('--sample-every', type=int, default=100,
+                        help='time every n-th operation for the latency percentiles')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc replay that measures peak memory')
+    parser.add_argument('--json', metavar='PATH', help='write the results to PATH as JSON')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare the results with a JSON report from an earlier run')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'map':<12}{'function':<17}{'workload':<14}{'n':>10}{'ops/s':>12}"
+          f"{'p50 us':>9}{'p99 us':>9}{'peak MB':>9}")
+    for count in args.sizes:
+        for workload in args.workloads:
+            for function_name in args.functions:
+                for map_name in args.maps:
+                    result = run_case(map_name, function_name, workload, count, args.seed,
+                                      args.sample_every, not args.no_memory)
+                    results.append(result)
+                    peak = '-' if result['peak_bytes'] is None else f"{result['peak_bytes'] / 2 ** 20:.1f}"
+                    print(f"{map_name:<12}{function_name:<17}{workload:<14}{count:>10}"
+                          f"{result['ops_per_sec']:>12.0f}{result['p50_us']:>9.2f}"
+                          f"{result['p99_us']:>9.2f}{peak:>9}")
+
+    if args.json:
+        report = {
+            'python': sys.version,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'sample_every': args.sample_every,
+            'results': results,
+        }
+        with open(args.json, 'w') as out:
+            json.dump(report, out, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
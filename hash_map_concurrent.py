@@ -0,0 +1,374 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Thread safe hash map made of independently locked segments, each one a
+#              hash_map_sc or hash_map_oa HashMap with its own table and resizes
+
+import os
+import threading
+
+import hash_map_sc
+from a6_include import DynamicArray, DynamicArrayException, hash_function_1, hash_function_2
+
+
+class ConcurrentHashMap:
+    def __init__(self, segments: int = 16, capacity: int = 176,
+                 function: callable = hash_function_1, map_class: type = hash_map_sc.HashMap,
+                 **map_options) -> None:
+        """
+        Initialize a hash map that can be shared between threads
+
+        The keys are spread over segments independent maps of map_class (hash_map_sc.HashMap or
+        hash_map_oa.HashMap) by a mix of their hash, and every segment has its own lock, so
+        threads working on different segments never wait for each other and a resize only
+        blocks its own segment. capacity is the initial capacity of all segments together, and
+        map_options are passed on to every segment.
+
+        Writes hold the segment lock and bump a sequence number of the segment before and after
+        changing it. Reads first run without the lock and keep their result if the sequence
+        number was even (no write in progress) and unchanged afterwards; otherwise they are
+        retried under the lock. Segments whose reads modify them (incremental_resize, the
+        move_to_front and transpose chain orders, instrument) always read under the lock.
+
+        With durable, a log path, every segment keeps its own write ahead log at that path
+        followed by '.segment' and its index, and recovers from it. A durable map must always
+        be opened again with the same number of segments and hash function, since they decide
+        which segment holds each key. Call close() to write out the logs when done.
+        """
+        if segments < 1:
+            raise ValueError("segments must be at least 1")
+
+        durable = map_options.pop('durable', None)
+        if durable is not None:
+            if not isinstance(durable, str):
+                raise ValueError("a durable ConcurrentHashMap takes a log path, not a log")
+            # a log set written with another segment count would put keys in the wrong segments
+            if (os.path.exists(f"{durable}.segment{segments}") or
+                    (os.path.exists(f"{durable}.segment0") and
+                     not os.path.exists(f"{durable}.segment{segments - 1}"))):
+                raise ValueError(f"the logs at {durable} were written with another number of "
+                                 f"segments")
+
+        self._hash_function = function
+        self._segment_count = segments
+        self._maps = []
+        for index in range(segments):
+            if durable is not None:
+                map_options['durable'] = f"{durable}.segment{index}"
+            self._maps.append(map_class(max(1, capacity // segments), function, **map_options))
+        self._locks = [threading.Lock() for _ in range(segments)]
+        self._sequences = [0] * segments
+
+        # unlocked reads are only safe when get() and contains_key() leave the segment as it is
+        self._optimistic_reads = (map_options.get('incremental_resize', False) is False and
+                                  map_options.get('chain_order', 'fixed') in ('fixed', 'sorted') and
+                                  map_options.get('instrument', False) is False)
+
+    def get_size(self) -> int:
+        """
+        Return size of map, the sum of the segment sizes at the time each was read
+        """
+        return sum(hash_map.get_size() for hash_map in self._maps)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the sum of the segment capacities
+        """
+        return sum(hash_map.get_capacity() for hash_map in self._maps)
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    # ------------------------------------------------------------------ #
+
+    def _segment(self, hash_val: int) -> int:
+        """
+        This method returns the index of the segment holding the key with the given hash. The
+        hash is mixed (Fibonacci hashing) before the segment is picked, so the keys of one
+        segment do not all share a remainder that the segment's own bucket index would then
+        repeat. The segment is handed the same hash, so no key is hashed twice.
+
+        :params: hash_val: the hash of the key
+
+        :return: the index of the segment
+        """
+        return ((hash_val * 2654435761) >> 16) % self._segment_count
+
+    def _read(self, index: int, read: callable) -> object:
+        """
+        This method runs a read only operation on a segment, without its lock if no write
+        overlapped it, otherwise again under the lock.
+
+        :params: index: the index of the segment
+                 read: a callable taking the segment map and returning the result
+
+        :return: the result of read
+        """
+        if self._optimistic_reads is True:
+            sequence = self._sequences[index]
+            if sequence % 2 == 0:
+                try:
+                    result = read(self._maps[index])
+                except (DynamicArrayException, IndexError):
+                    # a read racing a resize can index the old bucket array with the new
+                    # capacity, the locked retry below gives the real answer
+                    pass
+                else:
+                    if self._sequences[index] == sequence:
+                        return result
+
+        with self._locks[index]:
+            return read(self._maps[index])
+
+    def _write(self, index: int, write: callable) -> object:
+        """
+        This method runs an operation that may change a segment under the segment lock, with
+        the sequence number of the segment odd while it runs.
+
+        :params: index: the index of the segment
+                 write: a callable taking the segment map and returning the result
+
+        :return: the result of write
+        """
+        with self._locks[index]:
+            self._sequences[index] += 1
+            try:
+                return write(self._maps[index])
+            finally:
+                self._sequences[index] += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map, adding it if the key is new.
+
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+
+        :return: None
+        """
+        hash_val = self._hash_function(key)
+        self._write(self._segment(hash_val),
+                    lambda hash_map: hash_map._put_hashed(key, value, hash_val))
+
+    def put_if_absent(self, key: str, value: object) -> object:
+        """
+        This method atomically stores the value under the key unless the key is already in the
+        hash map.
+
+        :params: key: the key of the entry we are storing
+                 value: the value to store if the key is missing
+
+        :return: the value already associated with the key, or None if the value was stored
+        """
+        hash_val = self._hash_function(key)
+
+        def write(hash_map):
+            if hash_map._contains_hashed(key, hash_val):
+                return hash_map._get_hashed(key, hash_val)
+            hash_map._put_hashed(key, value, hash_val)
+            return None
+
+        return self._write(self._segment(hash_val), write)
+
+    def compute(self, key: str, fn: callable) -> object:
+        """
+        This method atomically replaces the value associated with the key by fn(value), or
+        stores fn(None) if the key is missing. No other thread can change the key in between,
+        so fn may safely build on the old value (a counter increment, for example). fn runs
+        under the segment lock and must not use this hash map.
+
+        :params: key: the key of the entry we are updating
+                 fn: a callable taking the current value (or None) and returning the new value
+
+        :return: the new value associated with the key
+        """
+        hash_val = self._hash_function(key)
+
+        def write(hash_map):
+            value = fn(hash_map._get_hashed(key, hash_val))
+            hash_map._put_hashed(key, value, hash_val)
+            return value
+
+        return self._write(self._segment(hash_val), write)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key, or None if the key is not
+        in the hash map.
+
+        :params: key: the key we are looking for
+
+        :return: the value associated with the key, or None
+        """
+        hash_val = self._hash_function(key)
+        return self._read(self._segment(hash_val),
+                          lambda hash_map: hash_map._get_hashed(key, hash_val))
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False.
+
+        :params: key: the key we are looking for
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        hash_val = self._hash_function(key)
+        return self._read(self._segment(hash_val),
+                          lambda hash_map: hash_map._contains_hashed(key, hash_val))
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map.
+
+        :params: key: the key we are looking for
+
+        :return: None
+        """
+        hash_val = self._hash_function(key)
+        self._write(self._segment(hash_val),
+                    lambda hash_map: hash_map._remove_hashed(key, hash_val))
+
+    def clear(self) -> None:
+        """
+        This method clears every segment. The segments are cleared one after the other, so a
+        concurrent put() may survive in a segment that was already cleared.
+
+        :params:
+
+        :return: None
+        """
+        for index in range(self._segment_count):
+            self._write(index, lambda hash_map: hash_map.clear())
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array of (key, value) tuples of the hash map. Each segment
+        is copied under its lock, so the result holds every segment as it was at one moment,
+        but not all segments at the same moment.
+
+        :params:
+
+        :return: a dynamic array where each index contains a tuple of key/value pairs
+        """
+        result_arr = DynamicArray()
+        for key, value in self.items():
+            result_arr.append((key, value))
+        return result_arr
+
+    def close(self) -> None:
+        """
+        This method writes out and closes the write ahead log of every segment of a durable
+        map. The map cannot be changed afterwards.
+
+        :params:
+
+        :return: None
+        """
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                wal = self._maps[index].get_wal()
+                if wal is not None:
+                    wal.close()
+
+    def items(self):
+        """
+        This method iterates over the (key, value) pairs of the hash map, copying one segment
+        at a time under its lock. Other threads may keep using the map meanwhile; the pairs of
+        each segment are as they were when it was copied.
+
+        :params:
+
+        :return: a generator of (key, value) tuples
+        """
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                pairs = [(entry.key, entry.value) for entry in self._maps[index]]
+            yield from pairs
+
+    def __iter__(self):
+        """
+        Return a generator of the keys of the hash map, one segment at a time as items() does
+        """
+        for key, _ in self.items():
+            yield key
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+
+    print("\ncounters shared by threads")
+    print("--------------------------")
+    for map_class, options in ((hash_map_sc.HashMap, {}),
+                               (hash_map_oa.HashMap, {'probing': 'double'})):
+        m = ConcurrentHashMap(8, 64, hash_function_2, map_class, **options)
+
+        def work(worker):
+            for i in range(2000):
+                m.compute('counter' + str(i % 50), lambda value: (value or 0) + 1)
+                m.put_if_absent('worker' + str(worker), i)
+                m.get('counter' + str(i % 7))
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(map_class.__module__, m.get_size(), m.get('counter0'),
+              sum(m.get('counter' + str(i)) for i in range(50)),
+              sorted(m.get('worker' + str(worker)) for worker in range(8)))
+
+    print("\ndurable segments recover their own keys")
+    print("---------------------------------------")
+    import tempfile
+    for map_class, options in ((hash_map_sc.HashMap, {}),
+                               (hash_map_oa.HashMap, {'probing': 'double'})):
+        with tempfile.TemporaryDirectory() as directory:
+            path = directory + '/map.wal'
+            m = ConcurrentHashMap(4, 16, hash_function_2, map_class, durable=path, **options)
+            for i in range(50):
+                m.put('key' + str(i), i)
+            m.remove('key7')
+            m.close()
+
+            m = ConcurrentHashMap(4, 16, hash_function_2, map_class, durable=path, **options)
+            expected = {'key' + str(i): i for i in range(50) if i != 7}
+            print(map_class.__module__, m.get_size(), m.get_keys_and_values().length() == 49,
+                  all(m.get(key) == value for key, value in expected.items()),
+                  m.contains_key('key7'))
+            m.close()
+            try:
+                ConcurrentHashMap(8, 16, hash_function_2, map_class, durable=path, **options)
+            except ValueError as error:
+                print(error.args[0].startswith('the logs'))
+
+    print("\nevery key is hashed once")
+    print("------------------------")
+    for map_class, options in ((hash_map_sc.HashMap, {}), (hash_map_oa.HashMap, {}),
+                               (hash_map_oa.HashMap, {'compact': True})):
+        calls = []
+
+        def counted_hash(key: str) -> int:
+            calls.append(key)
+            return hash_function_2(key)
+
+        m = ConcurrentHashMap(4, 16, counted_hash, map_class, **options)
+        for i in range(100):
+            m.put('key' + str(i), i)
+        del calls[:]
+        m.put('key1', 'one')
+        m.get('key1')
+        m.contains_key('key2')
+        m.compute('key3', lambda value: value + 1)
+        m.put_if_absent('key4', 0)
+        m.remove('key5')
+        print(type(m._maps[0]).__module__, len(calls), m.get('key1'), m.get('key3'),
+              m.contains_key('key5'))
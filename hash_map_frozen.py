@@ -0,0 +1,325 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Immutable hash map built as a minimal perfect hash table (compress, hash and
+#              displace), answering every lookup with a single probe
+
+from array import array
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_include import HashEntry, ItemsView, KeysView, ValuesView
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+_LOW = 0xFFFFFFFF
+_MULTIPLIER = 0x9E3779B97F4A7C15
+
+# average number of keys per displacement bucket; with two, an eighth of the keys are alone in
+# their bucket and the slots they are left keep the search for the last larger buckets short
+_BUCKET_SIZE = 2
+
+# displacements tried for one bucket before the build starts over with another salt
+_MAX_TRIES_PER_KEY = 64
+
+# hashed when pickling, to tell whether the unpickling process hashes strings the same way
+_FINGERPRINT_KEY = 'hash_map_frozen'
+
+
+def _mix(key: str, salt: int) -> int:
+    """
+    Return the 64 bit hash of the key under the given salt, from which the bucket (low 32 bits)
+    and the two position hashes (bits 32 to 63, and bits 16 to 47) of the key are taken
+    """
+    return ((hash(key) ^ salt) * _MULTIPLIER) & _MASK
+
+
+def _place(mixed: list, slot_count: int, bucket_count: int) -> array:
+    """
+    This function searches a displacement for every bucket so that the keys land on distinct
+    slots, the slot of a key being (f1 + d0 * f2 + d1) % slot_count for the displacement
+    (d0, d1) of its bucket.
+
+    Buckets are placed from the largest down, while the table is still empty enough for a
+    search to succeed quickly. Buckets of a single key are placed last without any search, by
+    picking d1 so the key lands on the next free slot.
+
+    :params: mixed: the mixed hash of every key
+             slot_count: the number of slots, the number of keys
+             bucket_count: the number of buckets
+
+    :return: the displacements, d0 << 32 | d1 for every bucket, or None if some bucket could
+             not be placed
+    """
+    buckets = [[] for _ in range(bucket_count)]
+    for index, m in enumerate(mixed):
+        buckets[(m & _LOW) % bucket_count].append(index)
+
+    displacements = array('Q', bytes(8 * bucket_count))
+    taken = bytearray(slot_count)
+    order = sorted(range(bucket_count), key=lambda bucket: len(buckets[bucket]), reverse=True)
+
+    position = 0
+    while position < bucket_count and len(buckets[order[position]]) > 1:
+        bucket = order[position]
+        hashes = [(mixed[index] >> 32, (mixed[index] >> 16) & _LOW) for index in buckets[bucket]]
+        tries = 0
+        found = False
+        d0 = 0
+        while found is False and d0 < slot_count:
+            bases = [(f1 + d0 * f2) % slot_count for f1, f2 in hashes]
+            # keys sharing a base slot stay together whatever d1 is
+            if len(set(bases)) == len(bases):
+                for d1 in range(slot_count):
+                    for base in bases:
+                        if taken[(base + d1) % slot_count] != 0:
+                            break
+                    else:
+                        for base in bases:
+                            taken[(base + d1) % slot_count] = 1
+                        displacements[bucket] = d0 << 32 | d1
+                        found = True
+                        break
+                    tries += 1
+                    if tries > _MAX_TRIES_PER_KEY * slot_count:
+                        return None
+            d0 += 1
+        if found is False:
+            return None
+        position += 1
+
+    # the single key buckets fill the remaining slots in order
+    free = (slot for slot in range(slot_count) if taken[slot] == 0)
+    while position < bucket_count and len(buckets[order[position]]) == 1:
+        bucket = order[position]
+        f1 = mixed[buckets[bucket][0]] >> 32
+        displacements[bucket] = (next(free) - f1) % slot_count
+        position += 1
+
+    return displacements
+
+
+class FrozenHashMap:
+    def __init__(self, pairs, function: callable = hash_function_1) -> None:
+        """
+        Initialize an immutable hash map holding the given (key, value) pairs, with exactly one
+        slot per key and a single probe for every lookup. The keys are spread over about one
+        bucket per two keys, and each bucket stores one displacement that moves its keys onto
+        free slots, so the whole index takes four bytes per key (CHD, compress, hash and
+        displace). A lookup reads the displacement of the key's bucket, computes its slot and
+        compares the one key stored there.
+
+        Keys are hashed with the built in string hash, mixed with a salt, rather than with
+        function: hash_function_1 gives every anagram of a key the same hash and
+        hash_function_2 collides often among short keys, and keys that share their hashes can
+        never be moved apart by a displacement. String hashes are cached on the key objects, so
+        repeated lookups of the same keys do not hash them again. function is kept as the hash
+        function of the map for the entries handed out by iteration.
+
+        A key given more than once keeps its last value. Use freeze() of hash_map_sc.HashMap or
+        hash_map_oa.HashMap to build one from a map.
+        """
+        latest = {}
+        for key, value in pairs:
+            latest[key] = value
+        self._hash_function = function
+        self._build(list(latest), list(latest.values()))
+
+    def _build(self, keys: list, values: list) -> None:
+        """
+        This method lays the keys and values out in slot order, searching a salt for which
+        every bucket can be placed.
+
+        :params: keys: the distinct keys
+                 values: the value of every key, in the same order
+
+        :return: None
+        """
+        size = len(keys)
+        slot_count = max(1, size)
+        bucket_count = max(1, (size + _BUCKET_SIZE - 1) // _BUCKET_SIZE)
+
+        salt = 0
+        while True:
+            mixed = [_mix(key, salt) for key in keys]
+            displacements = _place(mixed, slot_count, bucket_count)
+            if displacements is not None:
+                break
+            salt += 1
+
+        # store every key and value at its slot; an empty map keeps one slot holding no key
+        self._keys = [None] * slot_count
+        self._values = [None] * slot_count
+        for key, value, m in zip(keys, values, mixed):
+            d = displacements[(m & _LOW) % bucket_count]
+            slot = ((m >> 32) + (d >> 32) * ((m >> 16) & _LOW) + (d & _LOW)) % slot_count
+            self._keys[slot] = key
+            self._values[slot] = value
+
+        self._size = size
+        self._salt = salt
+        self._slot_count = slot_count
+        self._bucket_count = bucket_count
+        self._displacements = displacements
+
+    def __getstate__(self) -> dict:
+        """
+        Return the state to pickle, with a fingerprint of the string hash of this process
+        """
+        return {'keys': self._keys, 'values': self._values, 'function': self._hash_function,
+                'size': self._size, 'salt': self._salt, 'displacements': self._displacements,
+                'fingerprint': hash(_FINGERPRINT_KEY)}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled map. String hashes are randomized per process, so unless this process
+        hashes strings as the pickling one did the table is built again.
+        """
+        self._hash_function = state['function']
+        if state['fingerprint'] == hash(_FINGERPRINT_KEY):
+            self._keys = state['keys']
+            self._values = state['values']
+            self._size = state['size']
+            self._salt = state['salt']
+            self._displacements = state['displacements']
+            self._slot_count = len(self._keys)
+            self._bucket_count = len(self._displacements)
+            return
+
+        keys = [key for key in state['keys'] if key is not None]
+        self._build(keys, state['values'][:len(keys)])
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return the number of slots of the map, equal to its size (at least 1)
+        """
+        return self._slot_count
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    # ------------------------------------------------------------------ #
+
+    def table_load(self) -> float:
+        """
+        Return the share of slots holding a key, 1.0 unless the map is empty
+        """
+        return self._size / self._slot_count
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key, or None if the key is not
+        in the hash map. Exactly one slot is looked at.
+
+        :params: key: the key we are looking for
+
+        :return: the value associated with the key, or None
+        """
+        m = ((hash(key) ^ self._salt) * _MULTIPLIER) & _MASK
+        d = self._displacements[(m & _LOW) % self._bucket_count]
+        slot = ((m >> 32) + (d >> 32) * ((m >> 16) & _LOW) + (d & _LOW)) % self._slot_count
+        if self._keys[slot] == key:
+            return self._values[slot]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False.
+        Exactly one slot is looked at.
+
+        :params: key: the key we are looking for
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        m = ((hash(key) ^ self._salt) * _MULTIPLIER) & _MASK
+        d = self._displacements[(m & _LOW) % self._bucket_count]
+        slot = ((m >> 32) + (d >> 32) * ((m >> 16) & _LOW) + (d & _LOW)) % self._slot_count
+        return self._keys[slot] == key
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+
+        :params:
+
+        :return: a dynamic array where each index contains a tuple of key/value pairs
+        """
+        result_arr = DynamicArray()
+        for index in range(self._size):
+            result_arr.append((self._keys[index], self._values[index]))
+        return result_arr
+
+    def __iter__(self):
+        """
+        This method iterates over the entries of the map in slot order, as HashEntry objects
+        carrying the key's hash under the map's hash function, so the map can be exported like
+        the others (see hash_map_mmap.write_map).
+
+        :params:
+
+        :return: a generator of the entries of the map
+        """
+        function = self._hash_function
+        for index in range(self._size):
+            key = self._keys[index]
+            yield HashEntry(key, self._values[index], function(key))
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import pickle
+    import time
+
+    import hash_map_oa
+    import hash_map_sc
+
+    for map_class, options in ((hash_map_sc.HashMap, {}),
+                               (hash_map_oa.HashMap, {'probing': 'double'})):
+        m = map_class(11, hash_function_2, **options)
+        for i in range(100000):
+            m.put('key' + str(i), i)
+        # anagrams share hash_function_1 and must still get slots of their own
+        for key in ('listen', 'silent', 'enlist', 'tinsel'):
+            m.put(key, key.upper())
+
+        start = time.perf_counter()
+        frozen = m.freeze()
+        built = time.perf_counter() - start
+        print(map_class.__module__, frozen.get_size(), frozen.get_capacity(), frozen.table_load(),
+              all(frozen.get(key) == value for key, value in m.items()),
+              frozen.get('silent'), frozen.get('missing'), frozen.contains_key('key99999'),
+              f"{built:.2f}s")
+
+    copy = pickle.loads(pickle.dumps(frozen))
+    print(copy.get('key42'), copy.get('tinsel'), FrozenHashMap([]).get('anything'),
+          FrozenHashMap([('a', 1), ('b', 2)]).get('b'))
@@ -0,0 +1,421 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Entry, chain and view types shared by the hash map implementations
+
+
+class HashEntry:
+    # slots drop the per-instance __dict__, which is most of the memory of a small entry
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Initialize an open addressing entry. The full hash of the key is kept so probes can
+        compare hashes before keys and resizes never call the hash function again.
+        """
+        self.key = key
+        self.value = value
+        self.hash = hash_val
+        self.is_tombstone = False
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+class HashNode:
+    __slots__ = ('next', 'key', 'value', 'hash')
+
+    def __init__(self, key: str, value: object, hash_val: int, next: "HashNode" = None) -> None:
+        """
+        Initialize a separate chaining node, keeping the full hash of its key
+        """
+        self.next = next
+        self.key = key
+        self.value = value
+        self.hash = hash_val
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
+
+
+class HashChain:
+    __slots__ = ('_head', '_size')
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty singly linked chain of HashNodes
+        """
+        self._head = None
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = 'SLL ['
+        node = self._head
+        while node is not None:
+            out += str(node)
+            if node.next is not None:
+                out += ' -> '
+            node = node.next
+        out += ']'
+        return out
+
+    def __getstate__(self) -> list:
+        """
+        Return the contents of the chain as a flat list of (key, value, hash) tuples, so pickling
+        a long chain does not recurse once per node
+        """
+        return [(node.key, node.value, node.hash) for node in self]
+
+    def __setstate__(self, state: list) -> None:
+        """
+        Rebuild the chain from the list returned by __getstate__(), in the same order
+        """
+        self._head = None
+        self._size = 0
+        for key, value, hash_val in reversed(state):
+            HashChain.insert(self, key, value, hash_val)
+
+    def __iter__(self):
+        """
+        This method iterates over the nodes of the chain. The next node is read before a node is
+        handed out, so the caller may relink the node it received into another chain.
+
+        :params:
+
+        :return: a generator of the nodes of the chain
+        """
+        node = self._head
+        while node is not None:
+            next_node = node.next
+            yield node
+            node = next_node
+
+    def insert(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method adds a new node at the front of the chain.
+
+        :params: key: the key of the new node
+                 value: the value of the new node
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        self._head = HashNode(key, value, hash_val, self._head)
+        self._size += 1
+
+    def insert_node(self, node: HashNode) -> None:
+        """
+        This method links an existing node at the front of the chain.
+
+        :params: node: the node to link in
+
+        :return: None
+        """
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def contains(self, key: str, hash_val: int) -> HashNode:
+        """
+        This method returns the node holding the given key, comparing hashes before keys.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the node holding the key, or None if the key is not in the chain
+        """
+        node = self._head
+        while node is not None:
+            if node.hash == hash_val and node.key == key:
+                return node
+            node = node.next
+        return None
+
+    def remove(self, key: str, hash_val: int) -> bool:
+        """
+        This method unlinks the node holding the given key.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if a node was removed, otherwise False
+        """
+        previous = None
+        node = self._head
+        while node is not None:
+            if node.hash == hash_val and node.key == key:
+                if previous is None:
+                    self._head = node.next
+                else:
+                    previous.next = node.next
+                self._size -= 1
+                return True
+            previous = node
+            node = node.next
+        return False
+
+    def length(self) -> int:
+        """
+        Return the number of nodes in the chain
+        """
+        return self._size
+
+
+class MoveToFrontChain(HashChain):
+    """
+    Chain that moves a node to the front whenever a lookup finds it, so the keys read most
+    often sit at the start of their chains.
+    """
+    __slots__ = ()
+
+    def contains(self, key: str, hash_val: int) -> HashNode:
+        """
+        This method returns the node holding the given key, comparing hashes before keys. A node
+        that is found is moved to the front of the chain.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the node holding the key, or None if the key is not in the chain
+        """
+        previous = None
+        node = self._head
+        while node is not None:
+            if node.hash == hash_val and node.key == key:
+                if previous is not None:
+                    # unlink the node and relink it as the head
+                    previous.next = node.next
+                    node.next = self._head
+                    self._head = node
+                return node
+            previous = node
+            node = node.next
+        return None
+
+
+class TransposeChain(HashChain):
+    """
+    Chain that swaps a node with the one before it whenever a lookup finds it. Keys read often
+    drift to the front one step at a time, so a single lookup of a cold key cannot push a hot
+    key back the way move to front does.
+    """
+    __slots__ = ()
+
+    def contains(self, key: str, hash_val: int) -> HashNode:
+        """
+        This method returns the node holding the given key, comparing hashes before keys. A node
+        that is found swaps places with the node before it.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the node holding the key, or None if the key is not in the chain
+        """
+        before_previous = None
+        previous = None
+        node = self._head
+        while node is not None:
+            if node.hash == hash_val and node.key == key:
+                if previous is not None:
+                    # relink as before_previous -> node -> previous -> rest of the chain
+                    previous.next = node.next
+                    node.next = previous
+                    if before_previous is None:
+                        self._head = node
+                    else:
+                        before_previous.next = node
+                return node
+            before_previous = previous
+            previous = node
+            node = node.next
+        return None
+
+
+class SortedChain(HashChain):
+    """
+    Chain kept in ascending order of key hash. Lookups and removals of a missing key stop at
+    the first node with a larger hash instead of walking the whole chain.
+    """
+    __slots__ = ()
+
+    def insert(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method adds a new node at its place in hash order.
+
+        :params: key: the key of the new node
+                 value: the value of the new node
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        self.insert_node(HashNode(key, value, hash_val))
+
+    def insert_node(self, node: HashNode) -> None:
+        """
+        This method links an existing node in at its place in hash order.
+
+        :params: node: the node to link in
+
+        :return: None
+        """
+        previous = None
+        current = self._head
+        while current is not None and current.hash < node.hash:
+            previous = current
+            current = current.next
+
+        node.next = current
+        if previous is None:
+            self._head = node
+        else:
+            previous.next = node
+        self._size += 1
+
+    def contains(self, key: str, hash_val: int) -> HashNode:
+        """
+        This method returns the node holding the given key, stopping at the first larger hash.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the node holding the key, or None if the key is not in the chain
+        """
+        node = self._head
+        while node is not None and node.hash <= hash_val:
+            if node.hash == hash_val and node.key == key:
+                return node
+            node = node.next
+        return None
+
+    def remove(self, key: str, hash_val: int) -> bool:
+        """
+        This method unlinks the node holding the given key, stopping at the first larger hash.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if a node was removed, otherwise False
+        """
+        previous = None
+        node = self._head
+        while node is not None and node.hash <= hash_val:
+            if node.hash == hash_val and node.key == key:
+                if previous is None:
+                    self._head = node.next
+                else:
+                    previous.next = node.next
+                self._size -= 1
+                return True
+            previous = node
+            node = node.next
+        return False
+
+
+CHAIN_ORDERS = {
+    'fixed': HashChain,
+    'move_to_front': MoveToFrontChain,
+    'transpose': TransposeChain,
+    'sorted': SortedChain,
+}
+
+
+def get_chain_type(chain_order: str) -> type:
+    """
+    This function returns the chain class for the given chain order.
+
+    :params: chain_order: one of the names in CHAIN_ORDERS
+
+    :return: a HashChain subclass
+    """
+    if chain_order not in CHAIN_ORDERS:
+        raise ValueError(f"unknown chain order {chain_order!r}, expected one of "
+                         f"{', '.join(CHAIN_ORDERS)}")
+    return CHAIN_ORDERS[chain_order]
+
+
+class KeysView:
+    """
+    Lazy view of the keys of a hash map. It reads the map through its iterator, so it always
+    reflects the current contents and never copies them.
+    """
+    __slots__ = ('_map',)
+
+    def __init__(self, hash_map) -> None:
+        """
+        Initialize a view of the given hash map
+        """
+        self._map = hash_map
+
+    def __len__(self) -> int:
+        """
+        Return the number of keys in the hash map
+        """
+        return self._map.get_size()
+
+    def __iter__(self):
+        """
+        Return a generator of the keys of the hash map
+        """
+        for entry in self._map:
+            yield entry.key
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is in the hash map
+        """
+        return self._map.contains_key(key)
+
+
+class ValuesView(KeysView):
+    """
+    Lazy view of the values of a hash map.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the values of the hash map
+        """
+        for entry in self._map:
+            yield entry.value
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Return True if any key of the hash map holds the value, by scanning every entry
+        """
+        for entry in self._map:
+            if entry.value == value:
+                return True
+        return False
+
+
+class ItemsView(KeysView):
+    """
+    Lazy view of the (key, value) pairs of a hash map.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the (key, value) tuples of the hash map
+        """
+        for entry in self._map:
+            yield entry.key, entry.value
+
+    def __contains__(self, item: tuple) -> bool:
+        """
+        Return True if the key of the pair is in the hash map and holds the value of the pair
+        """
+        key, value = item
+        return self._map.contains_key(key) and self._map.get(key) == value
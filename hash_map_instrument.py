@@ -0,0 +1,257 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Optional instrumentation of the hash maps: probe and chain length statistics,
+#              resize counts and time spent resizing
+
+import time
+
+from hash_map_include import SortedChain
+
+
+class MapStats:
+    """
+    Statistics collected by an instrumented hash map. Probe lengths are kept as a histogram
+    (length -> number of operations), so recording one costs a dict update no matter how many
+    operations have been seen, and percentiles are read off the histogram.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize empty statistics
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        This method discards everything recorded so far.
+
+        :params:
+
+        :returns: None
+        """
+        self.operations = 0
+        self.total_probes = 0
+        self.max_probe = 0
+        self.histogram = {}
+        self.resizes = 0
+        self.resize_seconds = 0.0
+
+    def record_probe(self, length: int) -> None:
+        """
+        This method records the probe (or chain) length of one lookup.
+
+        :params: length: the number of buckets or nodes the lookup looked at
+
+        :returns: None
+        """
+        self.operations += 1
+        self.total_probes += length
+        if length > self.max_probe:
+            self.max_probe = length
+        self.histogram[length] = self.histogram.get(length, 0) + 1
+
+    def mean_probe(self) -> float:
+        """
+        Return the mean probe length, 0.0 if nothing has been recorded
+        """
+        if self.operations == 0:
+            return 0.0
+        return self.total_probes / self.operations
+
+    def percentile_probe(self, percent: float) -> int:
+        """
+        This method returns the smallest probe length that at least percent of the recorded
+        operations did not exceed.
+
+        :params: percent: a percentage between 0 and 100
+
+        :return: the probe length at that percentile, 0 if nothing has been recorded
+        """
+        if self.operations == 0:
+            return 0
+
+        needed = self.operations * percent / 100
+        seen = 0
+        for length in sorted(self.histogram):
+            seen += self.histogram[length]
+            if seen >= needed:
+                return length
+        return self.max_probe
+
+    def summary(self) -> dict:
+        """
+        Return the statistics as a dict: operations, mean_probe, max_probe, p99_probe,
+        histogram (sorted by length), resizes and resize_seconds
+        """
+        return {
+            'operations': self.operations,
+            'mean_probe': self.mean_probe(),
+            'max_probe': self.max_probe,
+            'p99_probe': self.percentile_probe(99),
+            'histogram': dict(sorted(self.histogram.items())),
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+        }
+
+
+class _CountingBuckets:
+    """
+    Stand-in for a bucket array that counts the buckets read through it.
+    """
+    __slots__ = ('_buckets', 'reads')
+
+    def __init__(self, buckets) -> None:
+        """
+        Initialize a counter around the given bucket array
+        """
+        self._buckets = buckets
+        self.reads = 0
+
+    def get_at_index(self, index: int) -> object:
+        """
+        Return the bucket at the given index, counting the read
+        """
+        self.reads += 1
+        return self._buckets.get_at_index(index)
+
+
+def _instrument_resizes(hash_map, stats: MapStats) -> None:
+    """
+    This function wraps resize_table() of the given map to time it, and the replacement of its
+    bucket array to count resizes (including incremental ones and shrinks).
+
+    :params: hash_map: the map to instrument
+             stats: the statistics to record into
+
+    :returns: None
+    """
+    resize_table = hash_map.resize_table
+    set_capacity = hash_map._set_capacity
+
+    def timed_resize_table(new_capacity):
+        start = time.perf_counter()
+        resize_table(new_capacity)
+        stats.resize_seconds += time.perf_counter() - start
+
+    def counted_set_capacity(new_capacity):
+        stats.resizes += 1
+        set_capacity(new_capacity)
+
+    hash_map.resize_table = timed_resize_table
+    hash_map._set_capacity = counted_set_capacity
+
+
+def instrument_open_addressing(hash_map, stats: MapStats) -> None:
+    """
+    This function makes a hash_map_oa HashMap record into stats. The probe lookup and the
+    resize methods are wrapped by attributes on the instance, so the class and every map that
+    is not instrumented run exactly the code they did before.
+
+    :params: hash_map: the map to instrument
+             stats: the statistics to record into
+
+    :returns: None
+    """
+    find_slot = hash_map._find_slot
+
+    def counted_find_slot(key, hash_val, buckets, capacity):
+        # every bucket the probe reads goes through the counter
+        counter = _CountingBuckets(buckets)
+        result = find_slot(key, hash_val, counter, capacity)
+        stats.record_probe(counter.reads)
+        return result
+
+    hash_map._find_slot = counted_find_slot
+    _instrument_resizes(hash_map, stats)
+
+
+def _nodes_visited(chain, key: str, hash_val: int, sorted_order: bool) -> int:
+    """
+    This function returns the number of nodes a lookup of the given key reads before it
+    stops, at the node holding the key, at the end of the chain, or for a sorted chain at the
+    first node with a larger hash.
+
+    :params: chain: the chain about to be searched
+             key: the key looked up
+             hash_val: the hash of the key
+             sorted_order: whether the chain is kept in hash order
+
+    :return: the number of nodes the lookup reads
+    """
+    visited = 0
+    node = chain._head
+    while node is not None:
+        visited += 1
+        if node.hash == hash_val and node.key == key:
+            break
+        if sorted_order is True and node.hash > hash_val:
+            break
+        node = node.next
+    return visited
+
+
+def instrumented_chain_type(chain_type: type, stats: MapStats) -> type:
+    """
+    This function returns a subclass of the given chain class that records the number of nodes
+    read by every lookup and removal into stats: up to the node holding the key, or the whole
+    chain for a miss (up to the first larger hash for a sorted chain). The nodes are counted
+    before the search runs, since move to front and transpose chains relink the node they
+    find, so instrumented lookups walk their chain twice.
+
+    :params: chain_type: the HashChain class to extend
+             stats: the statistics to record into
+
+    :return: the instrumented chain class
+    """
+    sorted_order = issubclass(chain_type, SortedChain)
+
+    class InstrumentedChain(chain_type):
+        __slots__ = ()
+
+        def contains(self, key, hash_val):
+            stats.record_probe(_nodes_visited(self, key, hash_val, sorted_order))
+            return chain_type.contains(self, key, hash_val)
+
+        def remove(self, key, hash_val):
+            stats.record_probe(_nodes_visited(self, key, hash_val, sorted_order))
+            return chain_type.remove(self, key, hash_val)
+
+    return InstrumentedChain
+
+
+def instrument_chaining(hash_map, stats: MapStats) -> None:
+    """
+    This function makes a hash_map_sc HashMap record resize counts and time into stats. Chain
+    searches are recorded by the chain class, see instrumented_chain_type().
+
+    :params: hash_map: the map to instrument
+             stats: the statistics to record into
+
+    :returns: None
+    """
+    _instrument_resizes(hash_map, stats)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import hash_map_sc
+    from a6_include import hash_function_1
+
+    # a few hot keys read over and over among many cold ones, in long chains
+    for chain_order in ('fixed', 'move_to_front', 'transpose', 'sorted'):
+        m = hash_map_sc.HashMap(11, hash_function_1, chain_order=chain_order, instrument=True,
+                                max_load_factor=20.0)
+        for i in range(200):
+            m.put('key' + str(i), i)
+        stats = m.get_instrumentation()
+        stats.reset()
+        for i in range(2000):
+            m.get('key' + str(i % 5 * 37))
+            m.contains_key('missing' + str(i))
+        print(chain_order, stats.operations, round(stats.total_probes / stats.operations, 2),
+              stats.max_probe)
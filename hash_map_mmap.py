@@ -0,0 +1,360 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Read only on-disk hash map: export of a HashMap to a file, and a reader that
+#              answers lookups straight from the memory mapped file
+
+import json
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import hash_function_1, hash_function_2
+from hash_map_include import HashEntry, ItemsView, KeysView, ValuesView
+
+# File layout, all integers little endian:
+#
+#   header  magic b'HMAP', format version (u32), hash function id (u32), value codec id (u32),
+#           capacity (u64), size (u64), slot table offset (u64), blob offset (u64)
+#   slots   capacity slots of (key hash (u64), blob offset of the entry (u64)); the offset of
+#           an empty slot is _EMPTY_SLOT. Keys are placed by linear probing from
+#           hash & (capacity - 1), capacity being a power of two at least twice the size.
+#   blob    one record per entry: key length (u32), value length (u32), the UTF-8 key, the
+#           encoded value
+_MAGIC = b'HMAP'
+_VERSION = 2
+_HEADER = struct.Struct('<4sIIIQQQQ')
+_SLOT = struct.Struct('<QQ')
+_RECORD = struct.Struct('<II')
+_EMPTY_SLOT = 0xFFFFFFFFFFFFFFFF
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+# hash functions the reader can find on its own, by the id stored in the header
+_FUNCTION_IDS = {hash_function_1: 1, hash_function_2: 2}
+_FUNCTIONS = {1: hash_function_1, 2: hash_function_2}
+
+# value codecs by name: (id stored in the header, encode, decode). decode is handed a memoryview.
+# 'pickle' can run arbitrary code while decoding, so readers must ask for it explicitly.
+CODECS = {
+    'bytes': (1, bytes, bytes),
+    'str': (2, lambda value: value.encode('utf-8'), lambda data: str(data, 'utf-8')),
+    'json': (3, lambda value: json.dumps(value, separators=(',', ':')).encode('utf-8'),
+             lambda data: json.loads(bytes(data))),
+    'pickle': (4, lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL), pickle.loads),
+}
+_CODEC_NAMES = {codec[0]: name for name, codec in CODECS.items()}
+
+
+def write_map(hash_map, path: str, encode='json', sync: bool = False) -> None:
+    """
+    This function writes the contents of a hash map to a file readable by MappedHashMap. Any
+    map whose iterator yields entries with .key, .value and .hash works (hash_map_oa,
+    hash_map_sc, hash_map_oa_compact, hash_map_parallel.ShardedHashMap). The file is written
+    next to path and renamed into place, so readers never see a partial file. With sync, the
+    file and its directory are flushed to disk before returning, so the new file survives a
+    crash.
+
+    Values are encoded with the codec named by encode, one of CODECS, which is recorded in the
+    file so readers decode them the same way. 'json' (the default) covers the JSON types;
+    'pickle' covers any picklable value, but reading it back runs code chosen by whoever wrote
+    the file, so use it only for files you trust. encode may also be a callable turning a
+    value into bytes, in which case readers must pass the matching decode callable.
+
+    :params: hash_map: the map to export, with string keys
+             path: the path of the file to write
+             encode: the name of a codec in CODECS, or a callable turning a value into bytes
+             sync: whether to fsync the file and the rename
+
+    :return: None
+    """
+    if callable(encode):
+        codec_id = 0
+    elif encode in CODECS:
+        codec_id, encode = CODECS[encode][:2]
+    else:
+        raise ValueError(f"unknown codec {encode!r}, expected one of {sorted(CODECS)} or a callable")
+
+    function = hash_map.get_hash_function()
+    size = hash_map.get_size()
+    capacity = 8
+    while capacity < 2 * size:
+        capacity *= 2
+    mask = capacity - 1
+
+    slots_offset = _HEADER.size
+    blob_offset = slots_offset + capacity * _SLOT.size
+    slots = bytearray(_SLOT.pack(0, _EMPTY_SLOT) * capacity)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as out:
+        out.write(_HEADER.pack(_MAGIC, _VERSION, _FUNCTION_IDS.get(function, 0), codec_id,
+                               capacity, size, slots_offset, blob_offset))
+        out.write(slots)
+
+        # append the records and place each one in the first free slot of its probe sequence
+        position = blob_offset
+        for entry in hash_map:
+            key = entry.key.encode('utf-8')
+            value = encode(entry.value)
+            hash_val = entry.hash & _HASH_MASK
+
+            index = hash_val & mask
+            while _SLOT.unpack_from(slots, index * _SLOT.size)[1] != _EMPTY_SLOT:
+                index = (index + 1) & mask
+            _SLOT.pack_into(slots, index * _SLOT.size, hash_val, position)
+
+            out.write(_RECORD.pack(len(key), len(value)))
+            out.write(key)
+            out.write(value)
+            position += _RECORD.size + len(key) + len(value)
+
+        # the slot table is only complete now, write it over the placeholder
+        out.seek(slots_offset)
+        out.write(slots)
+        if sync is True:
+            out.flush()
+            os.fsync(out.fileno())
+
+    os.replace(temp_path, path)
+    if sync is True:
+        _sync_directory(path)
+
+
+def _sync_directory(path: str) -> None:
+    """
+    Flush the directory holding the given path, making a rename inside it durable
+    """
+    directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+class MappedHashMap:
+    def __init__(self, path: str, function: callable = None, decode='json') -> None:
+        """
+        Open a file written by write_map() as a read only hash map. The file is memory mapped,
+        so opening costs no reading at all and processes opening the same file share its pages
+        through the page cache. Lookups read the slot table and compare the key bytes in place;
+        only the value of a key that is found is decoded.
+
+        function is needed only if the map was written with a hash function other than
+        hash_function_1 or hash_function_2, and must be that function.
+
+        decode names the codec of CODECS the values were written with, 'json' by default, and
+        must match the one recorded in the file. A file of pickled values is only opened with
+        decode='pickle', since unpickling runs code chosen by whoever wrote the file. For a file
+        written with a custom encode callable, decode is the matching callable; it is handed the
+        bytes of a value as a memoryview into the file and must not keep it.
+        """
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, function_id, codec_id, self._capacity, self._size,
+         self._slots_offset, self._blob_offset) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a hash map file of format version {_VERSION}")
+
+        written = _CODEC_NAMES.get(codec_id)
+        if not callable(decode) and decode in CODECS and decode == written:
+            decode = CODECS[decode][2]
+        elif not callable(decode) or written is not None:
+            self.close()
+            hint = "the decode matching its encode" if written is None else f"decode={written!r}"
+            if written == 'pickle':
+                hint += " if the file is trusted"
+            raise ValueError(f"{path} was written with another value codec, pass {hint}")
+
+        if function is None:
+            if function_id not in _FUNCTIONS:
+                self.close()
+                raise ValueError(f"{path} was written with a custom hash function, pass it as function")
+            function = _FUNCTIONS[function_id]
+        self._hash_function = function
+        self._decode = decode
+
+    def __enter__(self) -> "MappedHashMap":
+        """
+        Return the map itself for use in a with statement
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the map at the end of a with statement
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        This method unmaps and closes the file. The map cannot be used afterwards.
+
+        :params:
+
+        :return: None
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return the number of slots of the file
+        """
+        return self._capacity
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    # ------------------------------------------------------------------ #
+
+    def _find_record(self, key: str) -> int:
+        """
+        This method walks the probe sequence of the given key in the slot table, comparing
+        hashes first and then the key bytes in the mapped file.
+
+        :params: key: the key we are looking for
+
+        :return: the offset of the record holding the key, or -1 if the key is not in the map
+        """
+        # a valid file always has an empty slot, so a longer walk means a corrupt slot table
+        hash_val = self._hash_function(key) & _HASH_MASK
+        key_bytes = key.encode('utf-8')
+        view = self._view
+        mask = self._capacity - 1
+
+        index = hash_val & mask
+        for _ in range(self._capacity):
+            slot_hash, offset = _SLOT.unpack_from(view, self._slots_offset + index * _SLOT.size)
+            if offset == _EMPTY_SLOT:
+                return -1
+            if slot_hash == hash_val:
+                key_length = _RECORD.unpack_from(view, offset)[0]
+                start = offset + _RECORD.size
+                if key_length == len(key_bytes) and view[start:start + key_length] == key_bytes:
+                    return offset
+            index = (index + 1) & mask
+        raise ValueError("the slot table of the file has no empty slot, the file is corrupt")
+
+    def _read_value(self, offset: int) -> object:
+        """
+        Return the decoded value of the record at the given offset
+        """
+        key_length, value_length = _RECORD.unpack_from(self._view, offset)
+        start = offset + _RECORD.size + key_length
+        return self._decode(self._view[start:start + value_length])
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+
+        :params: key: the key we are looking for
+
+        :returns: the value associated with the given key, or None
+        """
+        offset = self._find_record(key)
+        if offset == -1:
+            return None
+        return self._read_value(offset)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False.
+        No value is decoded.
+
+        :params: key: the key we are looking for
+
+        :returns: True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find_record(key) != -1
+
+    def __iter__(self):
+        """
+        This method iterates over the entries of the file in slot order. Each one is decoded
+        into a HashEntry, so callers can read .key and .value as with hash_map_oa.
+
+        :params:
+
+        :return: a generator of the entries of the map
+        """
+        view = self._view
+        for index in range(self._capacity):
+            hash_val, offset = _SLOT.unpack_from(view, self._slots_offset + index * _SLOT.size)
+            if offset == _EMPTY_SLOT:
+                continue
+            key_length = _RECORD.unpack_from(view, offset)[0]
+            start = offset + _RECORD.size
+            key = str(view[start:start + key_length], 'utf-8')
+            yield HashEntry(key, self._read_value(offset), hash_val)
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    import hash_map_oa
+    import hash_map_oa_compact
+    import hash_map_sc
+
+    for m in (hash_map_sc.HashMap(11, hash_function_1), hash_map_oa.HashMap(11, hash_function_2),
+              hash_map_oa_compact.HashMap(11, hash_function_1)):
+        for i in range(5000):
+            m.put('key' + str(i), {'id': i})
+        m.put('üñî', [1, 2])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'map.hmap')
+            write_map(m, path)
+            with MappedHashMap(path) as mapped:
+                print(type(m).__module__, mapped.get_size(), mapped.get_capacity(),
+                      mapped.get('key42'), mapped.get('üñî'), mapped.get('missing'),
+                      mapped.contains_key('key4999'), sorted(mapped.keys()) == sorted(entry.key for entry in m))
+
+            # pickled values are read only when asked for
+            write_map(m, path, encode='pickle')
+            try:
+                MappedHashMap(path)
+            except ValueError as error:
+                print(error)
+            with MappedHashMap(path, decode='pickle') as mapped:
+                print(mapped.get('key42'))
@@ -5,26 +5,139 @@
 # Due Date: Dec 2, 2022
 # Description: Hash map using open addressing with quadratic probing
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+import hash_map_oa_compact
+from a6_include import (DynamicArray,
                         hash_function_1, hash_function_2)
+from hash_map_frozen import FrozenHashMap
+from hash_map_include import HashEntry, ItemsView, KeysView, ValuesView
+from hash_map_instrument import MapStats, instrument_open_addressing
+from hash_map_primes import is_prime, next_prime
+from hash_map_probing import QuadraticProbing, get_probing
+from hash_map_wal import WriteAheadLog, make_durable
+
+
+# placeholder left in the old buckets of an incremental resize once an entry has moved
+_MOVED = HashEntry(None, None, -1)
+_MOVED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __new__(cls, *args, compact: bool = False, **options):
+        """
+        Create the map, as a hash_map_oa_compact.HashMap if compact is set
+        """
+        if compact is True:
+            if len(args) > 2:
+                raise TypeError("the compact engine takes its options by keyword")
+            return hash_map_oa_compact.HashMap(*args, **options)
+        return super().__new__(cls)
+
+    def __init__(self, capacity: int, function, incremental_resize: bool = False,
+                 migrate_step: int = 4, max_occupancy: float = None,
+                 min_load_factor: float = 0.0, probing='quadratic',
+                 max_load_factor: float = 0.5, growth_factor: float = 2.0,
+                 power_of_two: bool = False, instrument: bool = False, durable=None,
+                 compact: bool = False) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        put() grows the table by growth_factor once the load factor reaches max_load_factor.
+        Capacities are primes, or with power_of_two powers of two indexed with a bit mask.
+        Quadratic probing on prime capacities only reaches half of the buckets, so it needs a
+        max_load_factor of at most 0.5.
+
+        probing selects the probe sequence: 'linear', 'quadratic', 'double' (double hashing,
+        with the step taken from whichever of hash_function_1 and hash_function_2 is not
+        function) or 'robin_hood' (linear probing with Robin Hood displacement and backward
+        shift deletion, which leaves no tombstones), or a strategy object from
+        hash_map_probing.
+
+        Removed entries stay behind as tombstones. Once live entries plus tombstones fill
+        max_occupancy of the buckets (by default halfway between max_load_factor and a full
+        table), put() rebuilds the table at the same capacity.
+
+        With a min_load_factor above zero, remove() shrinks the table once the load factor
+        drops below it (keep it well under half of max_load_factor so a shrunk table is not
+        grown straight back) and clear() returns the table to its initial capacity.
+
+        With incremental_resize, a put() that crosses the load factor limit allocates the
+        larger table but leaves the entries in the old one; each following put(), get(),
+        contains_key() and remove() then migrates migrate_step old buckets (at least 2 keeps
+        the migration ahead of the next resize) and lookups consult both tables meanwhile. The
+        new table itself is built ahead of time: once a resize or rebuild is near, every put()
+        adds a few buckets to it, so no single operation allocates a whole table.
+
+        With instrument, the map records the number of buckets read by every probe, the number
+        of resizes and the time spent in resize_table(), see get_instrumentation(). Maps
+        created without it run no instrumentation code at all.
+
+        With durable (a hash_map_wal.WriteAheadLog, or the path of one), the map first recovers
+        the contents saved in the log files and then logs every change it makes, see get_wal().
+        Maps created without it run no logging code at all.
+
+        With compact, the map is created as a hash_map_oa_compact.HashMap instead, which keeps
+        the buckets in flat parallel arrays with no entry object per key and takes
+        max_occupancy and min_load_factor (by keyword) but none of the other options.
         """
+        self._probing = get_probing(probing).for_function(function)
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1 for open addressing")
+        if max_load_factor > 0.5 and power_of_two is False and isinstance(self._probing, QuadraticProbing):
+            raise ValueError("quadratic probing on prime capacities needs a max_load_factor of at most 0.5")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+
+        self._max_load_factor = max_load_factor
+        self._growth_factor = growth_factor
+        self._power_of_two = power_of_two
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number (or a power of two)
+        if power_of_two is True:
+            self._capacity = self._round_capacity(capacity)
+        else:
+            self._capacity = next_prime(capacity)
         for _ in range(self._capacity):
             self._buckets.append(None)
 
         self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+        self._robin_hood = self._probing.robin_hood
+        self._probe_growth = self._probing.step_growth(power_of_two)
+        if max_occupancy is None:
+            max_occupancy = (1 + max_load_factor) / 2
+        self._max_occupancy = max_occupancy
+
+        # shrinking never goes below the initial capacity
+        self._min_load_factor = min_load_factor
+        self._min_capacity = self._capacity
+
+        # state of an incremental resize, _old_buckets is None when none is in progress
+        self._incremental = incremental_resize
+        self._migrate_step = migrate_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # buckets of the table the next incremental resize or rebuild will switch to, filled by
+        # put() as it nears; None when not started
+        self._next_buckets = None
+        self._next_capacity = 0
+
+        # bumped by every insertion, removal and resize so iterators can detect them
+        self._version = 0
+
+        self._instrumentation = None
+        if instrument is True:
+            self._instrumentation = MapStats()
+            instrument_open_addressing(self, self._instrumentation)
+
+        self._wal = None
+        if durable is not None:
+            self._wal = make_durable(self, durable)
 
     def __str__(self) -> str:
         """
@@ -69,6 +182,32 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        This method rounds a requested capacity up to the next power of two, or to the next
+        prime if the map does not use power of two capacities.
+
+        :params: capacity: the requested capacity
+
+        :return: the capacity the table will actually have
+        """
+        if self._power_of_two is True:
+            rounded = 2
+            while rounded < capacity:
+                rounded *= 2
+            return rounded
+
+        if is_prime(capacity):
+            return capacity
+        return next_prime(capacity)
+
+    def _grown_capacity(self) -> int:
+        """
+        Return the capacity requested when the table grows, at least one bucket more than now
+        so a small growth_factor cannot round back to the current capacity
+        """
+        return max(self._capacity + 1, int(self._capacity * self._growth_factor))
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -83,6 +222,12 @@ class HashMap:
         """
         return self._capacity
 
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
@@ -96,40 +241,441 @@ class HashMap:
 
         :return: None
         """
-        # resize table if load factor greater than 0.5
-        if self._size / self._capacity >= 0.5:
-            self.resize_table(2 * self._capacity)
+        self._put_hashed(key, value, self._hash_function(key))
 
-        # determine whether key is already in map
-        contains_key = self.contains_key(key)
-        # get initial index
-        hash_val = self._hash_function(key)
-        init_index = hash_val % self._capacity
-        index = init_index
-        j = 1
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method is put() for a key whose hash under the hash function of the map is already
+        known (see hash_map_concurrent).
 
-        # get val at the current index
-        val_at_index = self._buckets.get_at_index(init_index)
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+                 hash_val: the hash of the key
 
-        # find index to place entry
-        if contains_key is False:
-            while val_at_index is not None and val_at_index.key != key:
-                index = (init_index + (j * j)) % self._capacity
-                j += 1
-                val_at_index = self._buckets.get_at_index(index)
-        else:
-            while val_at_index is not None and val_at_index.is_tombstone is False and val_at_index.key != key:
-                index = (init_index + (j * j)) % self._capacity
-                j += 1
-                val_at_index = self._buckets.get_at_index(index)
+        :return: None
+        """
+        # find the entry holding the key, or the slot where it belongs, in one probe
+        index, entry = self._reserve_slot(key, hash_val)
 
         # if key is in map replace the value, otherwise add new value at the index
-        if val_at_index is not None and val_at_index.key == key and val_at_index.is_tombstone is False:
-            self._buckets.set_at_index(index, HashEntry(key, value))
+        if entry is not None:
+            entry.value = value
         else:
-            self._buckets.set_at_index(index, HashEntry(key, value))
+            self._insert_at(index, HashEntry(key, value, hash_val))
             self._size += 1
 
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the
+        hash map, the default is stored under the key and returned.
+
+        :params: key: the key we are looking for
+                 default: the value to store if the key is missing
+
+        :return: the value associated with the key after the call
+        """
+        return self.get_or_insert(key, lambda: default)
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the
+        hash map, factory() is called once and its result is stored under the key and returned.
+
+        :params: key: the key we are looking for
+                 factory: a callable taking no arguments that builds the missing value
+
+        :return: the value associated with the key after the call
+        """
+        hash_val = self._hash_function(key)
+        index, entry = self._reserve_slot(key, hash_val)
+        if entry is not None:
+            return entry.value
+
+        value = factory()
+        self._insert_at(index, HashEntry(key, value, hash_val))
+        self._size += 1
+        return value
+
+    def update_with(self, key: str, fn: callable) -> object:
+        """
+        This method replaces the value associated with the given key by fn(value). If the key is
+        not in the hash map, fn(None) is stored under the key.
+
+        :params: key: the key of the entry we are updating
+                 fn: a callable taking the current value (or None) and returning the new value
+
+        :return: the new value associated with the key
+        """
+        hash_val = self._hash_function(key)
+        index, entry = self._reserve_slot(key, hash_val)
+        if entry is not None:
+            entry.value = fn(entry.value)
+            return entry.value
+
+        value = fn(None)
+        self._insert_at(index, HashEntry(key, value, hash_val))
+        self._size += 1
+        return value
+
+    def put_many(self, pairs, hashes=None) -> None:
+        """
+        This method puts every key/value pair of the given iterable into the hash map. The table
+        is sized once for the whole input up front, so no pair triggers a resize and the
+        per-pair load factor checks of put() are skipped.
+
+        :params: pairs: an iterable of (key, value) tuples
+                 hashes: optionally the hash of every key, in order, as computed by this map's
+                         hash function (see hash_map_vectorized.hash_keys)
+
+        :return: None
+        """
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        self.reserve(len(pairs))
+
+        if hashes is None:
+            hash_function = self._hash_function
+            hashes = [hash_function(pair[0]) for pair in pairs]
+
+        # pull the lookups out of the per-pair path
+        buckets = self._buckets
+        capacity = self._capacity
+        find_slot = self._find_slot
+        insert_at = self._insert_at
+        size = self._size
+
+        for (key, value), hash_val in zip(pairs, hashes):
+            index, entry = find_slot(key, hash_val, buckets, capacity)
+            if entry is not None:
+                entry.value = value
+            else:
+                insert_at(index, HashEntry(key, value, hash_val))
+                size += 1
+
+        self._size = size
+
+    def merge_from(self, *others) -> None:
+        """
+        This method moves every entry of the other hash maps into this one, which must be
+        empty. All maps must use the same hash function and no two may hold the same key, as
+        with the shards of a hash_map_parallel.ShardedHashMap. The table is sized once for all
+        of them and the entries are moved with their cached hash, without hashing or comparing
+        any key. The other maps are left empty.
+
+        :params: others: hash maps of this class to empty into this one
+
+        :return: None
+        """
+        # the moved entries are not checked against keys already here
+        if self._size > 0:
+            raise ValueError("merge_from needs an empty map to merge into")
+        for other in others:
+            if other.get_hash_function() is not self._hash_function:
+                raise ValueError("merged maps must use the same hash function")
+
+        self.reserve(sum(other.get_size() for other in others))
+        self._version += 1
+        for other in others:
+            other._finish_migration()
+            self._rehash(other._buckets)
+            self._size += other.get_size()
+            other.clear()
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of the given iterable.
+
+        :params: keys: an iterable of keys
+
+        :return: a dynamic array holding, in order, the value of each key or None if it is missing
+        """
+        self._finish_migration()
+
+        buckets = self._buckets
+        capacity = self._capacity
+        hash_function = self._hash_function
+        find_slot = self._find_slot
+        result_arr = DynamicArray()
+        append = result_arr.append
+
+        for key in keys:
+            entry = find_slot(key, hash_function(key), buckets, capacity)[1]
+            append(None if entry is None else entry.value)
+
+        return result_arr
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of the given iterable from the hash map. Missing keys are
+        ignored. The table is shrunk at most once, after the last key.
+
+        :params: keys: an iterable of keys
+
+        :return: None
+        """
+        self._finish_migration()
+
+        buckets = self._buckets
+        capacity = self._capacity
+        hash_function = self._hash_function
+        find_slot = self._find_slot
+        remove_at = self._remove_at
+        removed = 0
+
+        for key in keys:
+            index, entry = find_slot(key, hash_function(key), buckets, capacity)
+            if entry is not None:
+                remove_at(index, entry)
+                removed += 1
+
+        self._size -= removed
+        if removed > 0 and self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
+
+    def reserve(self, count: int) -> None:
+        """
+        This method reserves room for count more insertions, such as a bulk load about to be
+        made with put. Afterwards the load factor
+        stays below max_load_factor and the occupancy below max_occupancy even if every key is
+        new, so the insertions need no checks of their own.
+
+        :params: count: the number of keys about to be inserted
+
+        :return: None
+        """
+        self._finish_migration()
+
+        needed = int((self._size + count) / self._max_load_factor) + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
+        elif (self._size + self._tombstones + count) / self._capacity >= self._max_occupancy:
+            self.compact()
+
+    def _reserve_slot(self, key: str, hash_val: int) -> (int, HashEntry):
+        """
+        This method prepares the hash map for writing the given key. It grows the table if
+        needed and returns the index of the entry holding the key together with that entry, or
+        the index where the key should be inserted together with None. During an incremental
+        resize an entry still in the old buckets is moved into the new buckets first.
+
+        :params: key: the key of the entry we are writing
+                 hash_val: the hash of the key
+
+        :return: a tuple of the index in the current buckets and the live entry (or None)
+        """
+        # resize table if load factor greater than the maximum, rebuild it in place if
+        # tombstones have filled it up, otherwise advance any pending migration
+        if self._size / self._capacity >= self._max_load_factor:
+            self._rebuild_table(self._grown_capacity())
+        elif (self._size + self._tombstones) / self._capacity >= self._max_occupancy:
+            self._rebuild_table(self._capacity)
+        elif self._old_buckets is not None:
+            self._migrate_buckets(self._migrate_step)
+        if self._incremental is True:
+            self._pregrow()
+
+        index, entry = self._find_slot(key, hash_val, self._buckets, self._capacity)
+        if entry is None and self._old_buckets is not None:
+            # the key may not have been migrated yet, pull it into the slot we found
+            old_index, entry = self._find_slot(key, hash_val, self._old_buckets, self._old_capacity)
+            if entry is not None:
+                self._old_buckets.set_at_index(old_index, _MOVED)
+                self._insert_at(index, entry)
+
+        return index, entry
+
+    def _insert_at(self, index: int, entry: HashEntry) -> None:
+        """
+        This method stores an entry in a free bucket of the current buckets (one returned by
+        _find_slot()), keeping count of the tombstones it overwrites. With Robin Hood probing the
+        bucket may hold a live entry, which is displaced further along. It does not change the
+        size.
+
+        :params: index: the index returned by _find_slot() for the key of the entry
+                 entry: the entry to store
+
+        :returns: None
+        """
+        self._version += 1
+        if self._robin_hood is True:
+            self._insert_robin_hood(index, entry)
+            return
+
+        if self._buckets.get_at_index(index) is not None:
+            self._tombstones -= 1
+        self._buckets.set_at_index(index, entry)
+
+    def _insert_robin_hood(self, index: int, entry: HashEntry) -> None:
+        """
+        This method stores an entry at the given index of the current buckets with Robin Hood
+        displacement: walking forward, the entry being carried swaps places with every resident
+        that is closer to its home bucket, until an empty bucket takes the last one. Starting at
+        the home bucket of the entry, this is also how resizes place entries.
+
+        :params: index: the insertion point returned by _find_slot(), or the home bucket
+                 entry: the entry to store
+
+        :returns: None
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        distance = (index - entry.hash % capacity) % capacity
+
+        while True:
+            resident = buckets.get_at_index(index)
+            if resident is None:
+                buckets.set_at_index(index, entry)
+                return
+
+            resident_distance = (index - resident.hash % capacity) % capacity
+            if resident_distance < distance:
+                # take the bucket and carry the resident on
+                buckets.set_at_index(index, entry)
+                entry = resident
+                distance = resident_distance
+
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+    def _remove_at(self, index: int, entry: HashEntry) -> None:
+        """
+        This method removes the entry at the given index of the current buckets. Normally the
+        entry becomes a tombstone. With Robin Hood probing the following entries that are not in
+        their home bucket are shifted back by one instead, so no tombstone is left. It does not
+        change the size.
+
+        :params: index: the index of the entry in the current buckets
+                 entry: the entry at that index
+
+        :returns: None
+        """
+        self._version += 1
+        if self._robin_hood is False:
+            entry.is_tombstone = True
+            self._tombstones += 1
+            return
+
+        buckets = self._buckets
+        capacity = self._capacity
+        next_index = (index + 1) % capacity
+        val_at_index = buckets.get_at_index(next_index)
+        while val_at_index is not None and val_at_index.hash % capacity != next_index:
+            buckets.set_at_index(index, val_at_index)
+            index = next_index
+            next_index = (index + 1) % capacity
+            val_at_index = buckets.get_at_index(next_index)
+        buckets.set_at_index(index, None)
+
+    def _find_slot(self, key: str, hash_val: int, buckets: DynamicArray, capacity: int) -> (int, HashEntry):
+        """
+        This method walks the probe sequence of the given key in the given buckets a single time.
+        If the key is there it returns the index of its entry and the entry itself. Otherwise it
+        returns the index where the key should be inserted, which is the first tombstone passed
+        while probing or the empty bucket that ended the probe (-1 if the probe sequence has no
+        free bucket at all), together with None. Entries are compared by their cached hash before
+        their key.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+                 buckets: the bucket array to probe
+                 capacity: the number of buckets in that array
+
+        :return: a tuple of the index and the live entry at that index (or None)
+        """
+        if self._robin_hood is True:
+            return self._find_slot_robin_hood(key, hash_val, buckets, capacity)
+
+        # get initial index
+        if self._power_of_two is True:
+            index = hash_val & (capacity - 1)
+        else:
+            index = hash_val % capacity
+        first_tombstone = -1
+        step = 0
+        j = 1
+
+        # walk the probe sequence until an empty bucket or the live entry for the key
+        val_at_index = buckets.get_at_index(index)
+        while val_at_index is not None:
+            if val_at_index.is_tombstone is True:
+                # remember the first reusable slot but keep looking for the key
+                if first_tombstone == -1:
+                    first_tombstone = index
+            elif val_at_index.hash == hash_val and val_at_index.key == key:
+                return index, val_at_index
+            if j == capacity:
+                # the probe sequence repeats from here on, every reachable bucket has been seen
+                index = -1
+                break
+            # advance along the probe sequence of the strategy
+            if step == 0:
+                step = self._probing.first_step(key, capacity)
+            else:
+                step += self._probe_growth
+            index = (index + step) % capacity
+            j += 1
+            val_at_index = buckets.get_at_index(index)
+
+        # key is absent, prefer reusing a tombstone over the empty bucket
+        if first_tombstone != -1:
+            index = first_tombstone
+        return index, None
+
+    def _find_slot_robin_hood(self, key: str, hash_val: int, buckets: DynamicArray,
+                              capacity: int) -> (int, HashEntry):
+        """
+        This method is _find_slot() for Robin Hood probing. The walk is linear, and stops early
+        at the first resident closer to its home bucket than the key would be to its own: the key
+        cannot be further along, and that bucket is where it would be inserted. Tombstones only
+        appear in the old buckets of an incremental resize and are stepped over.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+                 buckets: the bucket array to probe
+                 capacity: the number of buckets in that array
+
+        :return: a tuple of the index and the live entry at that index (or None)
+        """
+        if self._power_of_two is True:
+            index = hash_val & (capacity - 1)
+        else:
+            index = hash_val % capacity
+        distance = 0
+
+        val_at_index = buckets.get_at_index(index)
+        while val_at_index is not None:
+            if val_at_index.is_tombstone is False:
+                if val_at_index.hash == hash_val and val_at_index.key == key:
+                    return index, val_at_index
+                if (index - val_at_index.hash % capacity) % capacity < distance:
+                    return index, None
+            distance += 1
+            if distance == capacity:
+                return -1, None
+            index += 1
+            if index == capacity:
+                index = 0
+            val_at_index = buckets.get_at_index(index)
+
+        return index, None
+
+    def _find_entry(self, key: str, hash_val: int) -> HashEntry:
+        """
+        This method returns the live entry holding the given key, looking in the old buckets as
+        well while an incremental resize is in progress.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the live entry holding the key, or None if the key is not in the hash map
+        """
+        entry = self._find_slot(key, hash_val, self._buckets, self._capacity)[1]
+        if entry is None and self._old_buckets is not None:
+            entry = self._find_slot(key, hash_val, self._old_buckets, self._old_capacity)[1]
+        return entry
+
     def table_load(self) -> float:
         """
         This method returns the current hash table load factor.
@@ -148,13 +694,78 @@ class HashMap:
 
         :return: the number of empty buckets in the hash table.
         """
-        count = 0
-        # count how many empty buckets by iterating through map
+        # tombstones count as empty, so every bucket without a live entry is empty. Entries
+        # still waiting in the old buckets of an incremental resize are counted as if they had
+        # been migrated already, which is what a scan after finishing the migration would see.
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        This method returns the bucket statistics of the hash table, all read from counters the
+        hash map keeps up to date.
+
+        :params:
+
+        :return: a dict with size, capacity, table_load, empty_buckets (tombstones included),
+                 occupied_buckets (live entries) and tombstones (in the current buckets)
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self._size / self._capacity,
+            'empty_buckets': self._capacity - self._size,
+            'occupied_buckets': self._size,
+            'tombstones': self._tombstones,
+        }
+
+    def get_instrumentation(self) -> MapStats:
+        """
+        Return the statistics recorded by an instrumented map, or None if instrument is off
+        """
+        return self._instrumentation
+
+    def get_wal(self) -> WriteAheadLog:
+        """
+        Return the write ahead log of a durable map, or None if durable is off
+        """
+        return self._wal
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        This method returns an immutable copy of the hash map laid out as a minimal perfect hash
+        table: one slot per key and a single probe per lookup, see hash_map_frozen. The hash map
+        itself is left unchanged.
+
+        :params:
+
+        :return: a FrozenHashMap holding the same key/value pairs
+        """
+        return FrozenHashMap(self.items(), self._hash_function)
+
+    def cluster_length_histogram(self) -> dict:
+        """
+        This method scans the hash table for clusters, runs of consecutive buckets holding a
+        live entry or a tombstone, which are what probe sequences have to walk through. Long
+        clusters point at a poor hash function or at primary clustering.
+
+        :params:
+
+        :return: a dict from cluster length to the number of clusters of that length
+        """
+        self._finish_migration()
+
+        histogram = {}
+        run = 0
         for index in range(self._capacity):
-            if self._buckets.get_at_index(index) is None or self._buckets.get_at_index(index).is_tombstone is True:
-                count += 1
+            if self._buckets[index] is not None:
+                run += 1
+            elif run > 0:
+                histogram[run] = histogram.get(run, 0) + 1
+                run = 0
+        if run > 0:
+            histogram[run] = histogram.get(run, 0) + 1
 
-        return count
+        return dict(sorted(histogram.items()))
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -167,27 +778,232 @@ class HashMap:
         if new_capacity < self._size:
             return
 
-        # create copy of all buckets
-        arr = DynamicArray()
-        for index in range(self._buckets.length()):
-            arr.append(self._buckets.get_at_index(index))
+        # an explicit resize always completes synchronously
+        self._finish_migration()
+
+        # keep a reference to the old buckets, their entries are moved rather than copied
+        old_buckets = self._buckets
+        self._set_capacity(new_capacity)
+
+        # move old entries into the new buckets
+        self._rehash(old_buckets)
+
+    def compact(self) -> None:
+        """
+        This method rebuilds the hash table at its current capacity, dropping every tombstone so
+        probe sequences end at the first empty bucket again.
 
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(self._capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        This method shrinks the hash table to the smallest prime capacity that holds the current
+        entries within the load factor limit.
+
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(max(self._size, 1))
+
+    def _shrink_table(self) -> None:
+        """
+        This method shrinks the hash table after remove() drops the load factor below the low
+        water mark. The new capacity leaves the table at half of max_load_factor, but never goes
+        below the initial capacity.
+
+        :params:
+
+        :returns: None
+        """
+        new_capacity = self._round_capacity(
+            max(self._min_capacity, int(2 * self._size / self._max_load_factor)))
+        if new_capacity < self._capacity:
+            self._rebuild_table(new_capacity)
+
+    def _set_capacity(self, new_capacity: int) -> None:
+        """
+        This method replaces the buckets with an empty table of at least new_capacity buckets.
+        The capacity is rounded up to a prime (or power of two), and grown by growth_factor until
+        the entries currently in the hash map keep the load factor below max_load_factor once
+        moved in.
+
+        :params: new_capacity: the requested capacity of the hash table
+
+        :returns: None
+        """
         # determine prime capacity
-        if self._is_prime(new_capacity):
-            self._capacity = new_capacity
+        self._capacity = self._round_capacity(new_capacity)
+
+        # grow until the moved entries keep the load factor below the maximum, which is the
+        # capacity re-inserting them one at a time through put() would end up with
+        while self._size > 0 and (self._size - 1) / self._capacity >= self._max_load_factor:
+            self._capacity = self._round_capacity(self._grown_capacity())
+
+        # empty all buckets, and resize map to new capacity, taking over the table put() has
+        # been building for an incremental resize when it has this capacity
+        self._version += 1
+        if self._next_buckets is not None and self._next_capacity == self._capacity:
+            self._buckets = self._next_buckets
         else:
-            self._capacity = self._next_prime(new_capacity)
-
-        # empty all buckets, and resize map to new capacity
-        self._buckets = DynamicArray()
-        for _ in range(self._capacity):
+            self._buckets = DynamicArray()
+        self._next_buckets = None
+        while self._buckets.length() < self._capacity:
             self._buckets.append(None)
-        self._size = 0
+        self._tombstones = 0
+
+    def _pregrow(self) -> None:
+        """
+        This method spreads the allocation of the table of the next incremental resize (or
+        rebuild, if tombstones will fill the table first) over the puts leading up to it. Once
+        the puts left before it are no more than a quarter of the capacity, each put appends
+        just enough buckets to have the whole table ready when it comes.
+
+        :params:
+
+        :returns: None
+        """
+        grow_left = int(self._capacity * self._max_load_factor) - self._size
+        rebuild_left = int(self._capacity * self._max_occupancy) - self._size - self._tombstones
+        left = min(grow_left, rebuild_left)
+        if left > self._capacity // 4:
+            return
+
+        # a pre-grown table is reset by every resize, so its capacity is either the grown one or
+        # the current one, and the grown capacity is only computed when such a table is started
+        growing = grow_left <= rebuild_left
+        if (self._next_buckets is None or
+                growing is (self._next_capacity == self._capacity)):
+            self._next_buckets = DynamicArray()
+            self._next_capacity = (self._round_capacity(self._grown_capacity()) if growing
+                                   else self._capacity)
+        missing = self._next_capacity - self._next_buckets.length()
+        step = -(-missing // max(1, left))
+        for _ in range(min(step, missing)):
+            self._next_buckets.append(None)
+
+    def _rehash(self, old_buckets: DynamicArray) -> None:
+        """
+        This method moves every live entry of old_buckets into the current (empty) buckets. The
+        keys are known to be distinct and the new table has no tombstones, so each entry goes
+        straight into the first empty bucket of its probe sequence (or is placed by Robin Hood
+        displacement from its home bucket), without the load factor and duplicate checks of
+        put(), without allocating a new entry and without re-hashing its key. Double hashing is
+        the exception: the step of a colliding entry comes from hashing its key again.
+
+        :params: old_buckets: the buckets of the table before the resize
+
+        :returns: None
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        first_step = self._probing.first_step
+        growth = self._probe_growth
+
+        for index in range(old_buckets.length()):
+            entry = old_buckets.get_at_index(index)
+            if entry is None or entry.is_tombstone is True:
+                continue
+
+            if self._robin_hood is True:
+                self._insert_robin_hood(entry.hash % capacity, entry)
+                continue
+
+            # probe for the first empty bucket
+            new_index = entry.hash % capacity
+            step = 0
+            while buckets.get_at_index(new_index) is not None:
+                if step == 0:
+                    step = first_step(entry.key, capacity)
+                else:
+                    step += growth
+                new_index = (new_index + step) % capacity
+            buckets.set_at_index(new_index, entry)
+
+    def _rebuild_table(self, new_capacity: int) -> None:
+        """
+        This method grows the hash table when put() crosses the load factor limit, shrinks it
+        when remove() crosses the low water mark, or rebuilds it at the same capacity when
+        tombstones have filled it up. Without incremental resizing this is a plain
+        resize_table(). With it, the current buckets are kept as the old table and their entries
+        are migrated a few buckets at a time by the following operations.
+
+        :params: new_capacity: the new capacity of the hash table
+
+        :returns: None
+        """
+        if self._incremental is False:
+            self.resize_table(new_capacity)
+            return
+
+        # only one migration runs at a time
+        self._finish_migration()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+        self._set_capacity(new_capacity)
+        self._migrate_buckets(self._migrate_step)
+
+    def _migrate_buckets(self, count: int) -> None:
+        """
+        This method moves the live entries of the next count old buckets into the current buckets.
+        A moved entry leaves a tombstone behind so probe sequences in the old buckets stay intact.
+        Once every old bucket has been visited the old table is released.
+
+        :params: count: the number of old buckets to migrate
 
-        # copy old values into new resized map
-        for index in range(arr.length()):
-            if arr.get_at_index(index) is not None and arr.get_at_index(index).is_tombstone is False:
-                self.put(arr.get_at_index(index).key, arr.get_at_index(index).value)
+        :returns: None
+        """
+        old_buckets = self._old_buckets
+        buckets = self._buckets
+        capacity = self._capacity
+        stop = min(self._migrate_index + count, self._old_capacity)
+
+        for index in range(self._migrate_index, stop):
+            entry = old_buckets.get_at_index(index)
+            if entry is None or entry.is_tombstone is True:
+                continue
+
+            old_buckets.set_at_index(index, _MOVED)
+            if self._robin_hood is True:
+                self._insert_robin_hood(entry.hash % capacity, entry)
+                continue
+
+            # the key is not in the new buckets yet, so any free slot of its probe sequence will do
+            new_index = entry.hash % capacity
+            step = 0
+            val_at_index = buckets.get_at_index(new_index)
+            while val_at_index is not None and val_at_index.is_tombstone is False:
+                if step == 0:
+                    step = self._probing.first_step(entry.key, capacity)
+                else:
+                    step += self._probe_growth
+                new_index = (new_index + step) % capacity
+                val_at_index = buckets.get_at_index(new_index)
+            if val_at_index is not None:
+                self._tombstones -= 1
+            buckets.set_at_index(new_index, entry)
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+    def _finish_migration(self) -> None:
+        """
+        This method completes any incremental resize in progress.
+
+        :params:
+
+        :returns: None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._old_capacity)
 
     def get(self, key: str) -> object:
         """
@@ -199,22 +1015,25 @@ class HashMap:
         :returns: the value associated with the given key. If the key is not in the hash
                   map, the method returns None.
         """
-        # determine initial index
-        hash_val = self._hash_function(key)
-        init_index = hash_val % self._capacity
-        index = init_index
+        return self._get_hashed(key, self._hash_function(key))
+
+    def _get_hashed(self, key: str, hash_val: int) -> object:
+        """
+        This method is get() for a key whose hash under the hash function of the map is already
+        known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the value associated with the key, or None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._migrate_step)
 
-        j = 1
-        # get val at initial index
-        val_at_index = self._buckets.get_at_index(index)
-        # determine which index the key is at
-        while val_at_index is not None and val_at_index.key != key:
-            index = (init_index + j * j) % self._capacity
-            j += 1
-            val_at_index = self._buckets.get_at_index(index)
         # return value or None if no key exists
-        if val_at_index is not None and val_at_index.key == key and val_at_index.is_tombstone is False:
-            return val_at_index.value
+        entry = self._find_entry(key, hash_val)
+        if entry is not None:
+            return entry.value
         else:
             return None
 
@@ -229,25 +1048,24 @@ class HashMap:
         """
         if self._size == 0:
             return False
-        # determine initial index
-        hash_val = self._hash_function(key)
-        init_index = hash_val % self._capacity
-        index = init_index
 
-        j = 1
-        # get entry at initial index
-        val_at_index = self._buckets.get_at_index(index)
-        # find index where key is
-        while val_at_index is not None and val_at_index.key != key:
-            index = (init_index + j * j) % self._capacity
-            j += 1
-            val_at_index = self._buckets.get_at_index(index)
+        return self._contains_hashed(key, self._hash_function(key))
+
+    def _contains_hashed(self, key: str, hash_val: int) -> bool:
+        """
+        This method is contains_key() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._migrate_step)
 
         # return true if key exists, otherwise false
-        if val_at_index is not None and val_at_index.key == key and val_at_index.is_tombstone == False:
-            return True
-        else:
-            return False
+        return self._find_entry(key, hash_val) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -257,38 +1075,62 @@ class HashMap:
 
         :returns: None
         """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        This method is remove() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: None
+        """
         if self._size == 0:
             return
-        # get inital index
-        hash_val = self._hash_function(key)
-        init_index = hash_val % self._capacity
-        index = init_index
 
-        j = 1
-        # get val at initial index
-        val_at_index = self._buckets.get_at_index(index)
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._migrate_step)
 
-        # determine where the key is at
-        while val_at_index is not None and val_at_index.key != key:
-            index = (init_index + (j * j)) % self._capacity
-            j += 1
-            val_at_index = self._buckets.get_at_index(index)
-
-        # if key exists set its tombstone to true and decrement size
-        if val_at_index is not None and val_at_index.key == key and val_at_index.is_tombstone == False:
-            val_at_index.is_tombstone = True
+        # if key exists remove its entry and decrement size
+        index, entry = self._find_slot(key, hash_val, self._buckets, self._capacity)
+        if entry is not None:
+            self._remove_at(index, entry)
             self._size = self._size - 1
+        elif self._old_buckets is not None:
+            # tombstones left in the old buckets are dropped with them, so they are not counted
+            entry = self._find_slot(key, hash_val, self._old_buckets, self._old_capacity)[1]
+            if entry is not None:
+                entry.is_tombstone = True
+                self._size = self._size - 1
+
+        if entry is not None and self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
 
     def clear(self) -> None:
         """
         This method clears the contents of the hash map. It does not change the underlying hash
-        table capacity
+        table capacity, unless shrinking is enabled, in which case the table goes back to its
+        initial capacity
 
         :params:
 
         :returns:
         """
+        # drop any incremental resize in progress along with its entries
+        self._old_buckets = None
+        self._old_capacity = 0
+
         self._size = 0
+        self._version += 1
+
+        # go back to the initial capacity if shrinking is enabled
+        if self._min_load_factor > 0 and self._capacity != self._min_capacity:
+            self._set_capacity(self._min_capacity)
+            return
+
+        self._tombstones = 0
         for index in range(self._buckets.length()):
             self._buckets.set_at_index(index, None)
 
@@ -301,6 +1143,8 @@ class HashMap:
 
         :return: a dynamic array where each index contains a tuple of key/value pairs
         """
+        self._finish_migration()
+
         # initial result array
         result_arr = DynamicArray()
         # insert tuples of all key value pairs in result array
@@ -311,38 +1155,108 @@ class HashMap:
 
         return result_arr
 
+    def export_chunks(self, chunk_size: int = 4096):
+        """
+        This method streams the contents of the hash map in chunks, scanning the buckets once.
+        Each chunk is a pair of lists, the keys and the values, so no tuple is built per entry
+        and at most chunk_size pairs are held at a time. Inserting or removing a key, or
+        resizing the table, between chunks makes the export raise a RuntimeError.
+
+        :params: chunk_size: the largest number of pairs in a chunk
+
+        :return: a generator of (keys, values) tuples of lists with the same length
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self._finish_migration()
+        version = self._version
+        buckets = self._buckets
+
+        keys = []
+        values = []
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                keys.append(entry.key)
+                values.append(entry.value)
+                if len(keys) == chunk_size:
+                    yield keys, values
+                    if self._version != version:
+                        raise RuntimeError("hash map changed during export")
+                    keys = []
+                    values = []
+
+        if len(keys) > 0:
+            yield keys, values
+
+    def export_into(self, keys, values, start: int = 0) -> int:
+        """
+        This method writes the keys and values of the hash map into preallocated buffers, from
+        position start on, scanning the buckets once. The pair written at a position is the key
+        in keys and the value in values at that position.
+
+        :params: keys: a sequence supporting item assignment (list, array, ...) for the keys
+                 values: a sequence supporting item assignment for the values
+                 start: the first position to write
+
+        :return: the number of pairs written, which is the size of the hash map
+        """
+        if len(keys) - start < self._size or len(values) - start < self._size:
+            raise ValueError("buffers are too small for the contents of the hash map")
+
+        self._finish_migration()
+        buckets = self._buckets
+
+        position = start
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                keys[position] = entry.key
+                values[position] = entry.value
+                position += 1
+
+        return position - start
+
     def __iter__(self):
         """
-        This method enables the hash map to iterate across itself
+        This method iterates over the live entries of the hash map. Each call returns an
+        independent generator, so iterations can be nested. Inserting or removing a key, or
+        resizing the table, while an iteration is running makes the iteration raise a
+        RuntimeError at its next step; replacing the value of an existing key does not.
 
         :params:
 
-        :return: self
+        :return: a generator of the entries in the hash map
         """
-        self._index = 0
+        self._finish_migration()
+        version = self._version
+        buckets = self._buckets
 
-        return self
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
 
-    def __next__(self):
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
         """
-        This method will return the next item in the hash map, based on the current location of the
-        iterator
+        return KeysView(self)
 
-        :param:
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return ValuesView(self)
 
-        :return: the next item in the hash map
+    def items(self) -> ItemsView:
         """
-        try:
-            # get first value of the map
-            value = self._buckets.get_at_index(self._index)
-            while value is None or value.is_tombstone is True:
-                self._index += 1
-                value = self._buckets.get_at_index(self._index)
-        except DynamicArrayException:
-            raise StopIteration
-        # increment index and return that value
-        self._index += 1
-        return value
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return ItemsView(self)
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -570,3 +1484,26 @@ if __name__ == "__main__":
     #     index = (init_index + (j * j)) % 449
     #     j += 1
 
+
+    print("\nincremental resize latency")
+    print("--------------------------")
+    import gc
+    import time
+
+    def spread_hash(key: str) -> int:
+        return int(key) * 2654435761 % 4294967296
+
+    def slowest_put(incremental: bool) -> float:
+        m = HashMap(11, spread_hash, incremental_resize=incremental)
+        slowest = 0.0
+        # collector pauses would land on arbitrary puts
+        gc.disable()
+        for i in range(100000):
+            start = time.perf_counter()
+            m.put(str(i), i)
+            slowest = max(slowest, time.perf_counter() - start)
+        gc.enable()
+        return slowest
+
+    # no put of an incremental map should come near the cost of a whole resize
+    print(slowest_put(True) < slowest_put(False) / 4)
@@ -0,0 +1,844 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Hash map using open addressing with quadratic probing, stored in flat
+#              parallel arrays instead of one entry object per bucket. It has the API of
+#              hash_map_oa.HashMap except incremental resizing, other probe sequences,
+#              power of two capacities, instrumentation, durability, cluster_length_histogram(),
+#              export_chunks() and export_into(). Select it with hash_map_oa.HashMap(...,
+#              compact=True).
+
+from array import array
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_frozen import FrozenHashMap
+from hash_map_include import HashEntry, ItemsView, KeysView, ValuesView
+from hash_map_primes import is_prime, next_prime
+
+# bucket states kept in the state byte array
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_occupancy: float = 0.75,
+                 min_load_factor: float = 0.0) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+
+        Each bucket is a position in four parallel arrays: the key hashes in an array('q'), a
+        state byte (empty, live or tombstone) in a bytearray, and the keys and values in two
+        lists. A bucket costs about 25 bytes plus its key and value, with no entry object. Hash
+        functions must return values that fit in a signed 64 bit integer.
+
+        max_occupancy and min_load_factor work as in hash_map_oa.HashMap. The load factor limit
+        is fixed at 0.5 and the probe sequence is always quadratic. Incremental resizing,
+        instrumentation and durability are not available in this engine.
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._max_occupancy = max_occupancy
+
+        # shrinking never goes below the initial capacity
+        self._min_load_factor = min_load_factor
+        self._min_capacity = self._capacity
+
+        # bumped by every insertion, removal and resize so iterators can detect them
+        self._version = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == _TOMBSTONE) + '\n')
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        This method replaces the storage arrays with empty ones of the given capacity.
+
+        :params: capacity: the number of buckets to allocate
+
+        :returns: None
+        """
+        self._hashes = array('q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def put(self, key: str, value: object) -> None:
+        """
+        updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value must be replaced with the new value. If the given key is
+        not in the hash map, a new key/value pair is be added.
+
+        :param: key: the key of the entry we are storing
+                value: the value of associated
+
+        :return: None
+        """
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method is put() for a key whose hash under the hash function of the map is already
+        known (see hash_map_concurrent).
+
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        # find the bucket holding the key, or the bucket where it belongs, in one probe
+        index, found = self._reserve_slot(key, hash_val)
+
+        # if key is in map replace the value, otherwise add new value at the index
+        if found is True:
+            self._values[index] = value
+        else:
+            self._insert_at(index, key, value, hash_val)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the
+        hash map, the default is stored under the key and returned.
+
+        :params: key: the key we are looking for
+                 default: the value to store if the key is missing
+
+        :return: the value associated with the key after the call
+        """
+        return self.get_or_insert(key, lambda: default)
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the
+        hash map, factory() is called once and its result is stored under the key and returned.
+
+        :params: key: the key we are looking for
+                 factory: a callable taking no arguments that builds the missing value
+
+        :return: the value associated with the key after the call
+        """
+        hash_val = self._hash_function(key)
+        index, found = self._reserve_slot(key, hash_val)
+        if found is True:
+            return self._values[index]
+
+        value = factory()
+        self._insert_at(index, key, value, hash_val)
+        return value
+
+    def update_with(self, key: str, fn: callable) -> object:
+        """
+        This method replaces the value associated with the given key by fn(value). If the key is
+        not in the hash map, fn(None) is stored under the key.
+
+        :params: key: the key of the entry we are updating
+                 fn: a callable taking the current value (or None) and returning the new value
+
+        :return: the new value associated with the key
+        """
+        hash_val = self._hash_function(key)
+        index, found = self._reserve_slot(key, hash_val)
+        if found is True:
+            self._values[index] = fn(self._values[index])
+            return self._values[index]
+
+        value = fn(None)
+        self._insert_at(index, key, value, hash_val)
+        return value
+
+    def put_many(self, pairs, hashes=None) -> None:
+        """
+        This method puts every key/value pair of the given iterable into the hash map. The table
+        is sized once for the whole input up front, so no pair triggers a resize and the
+        per-pair load factor checks of put() are skipped.
+
+        :params: pairs: an iterable of (key, value) tuples
+                 hashes: optionally the hash of every key, in order, as computed by this map's
+                         hash function (see hash_map_vectorized.hash_keys)
+
+        :return: None
+        """
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        self.reserve(len(pairs))
+
+        if hashes is None:
+            hash_function = self._hash_function
+            hashes = [hash_function(pair[0]) for pair in pairs]
+
+        # pull the lookups out of the per-pair path
+        find_slot = self._find_slot
+        insert_at = self._insert_at
+        values = self._values
+
+        for (key, value), hash_val in zip(pairs, hashes):
+            index, found = find_slot(key, hash_val)
+            if found is True:
+                values[index] = value
+            else:
+                insert_at(index, key, value, hash_val)
+
+    def merge_from(self, *others) -> None:
+        """
+        This method moves every entry of the other hash maps into this one, which must be
+        empty. All maps must use the same hash function and no two may hold the same key, as
+        with the shards of a hash_map_parallel.ShardedHashMap. The table is sized once for all
+        of them and the entries are moved with their stored hash, without hashing any key. The
+        other maps are left empty.
+
+        :params: others: hash maps of this class to empty into this one
+
+        :return: None
+        """
+        # the moved entries are not checked against keys already here
+        if self._size > 0:
+            raise ValueError("merge_from needs an empty map to merge into")
+        for other in others:
+            if other.get_hash_function() is not self._hash_function:
+                raise ValueError("merged maps must use the same hash function")
+
+        self.reserve(sum(other.get_size() for other in others))
+        find_slot = self._find_slot
+        insert_at = self._insert_at
+        for other in others:
+            for index in other._live_slots():
+                key = other._keys[index]
+                hash_val = other._hashes[index]
+                insert_at(find_slot(key, hash_val)[0], key, other._values[index], hash_val)
+            other.clear()
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of the given iterable.
+
+        :params: keys: an iterable of keys
+
+        :return: a dynamic array holding, in order, the value of each key or None if it is missing
+        """
+        hash_function = self._hash_function
+        find_slot = self._find_slot
+        values = self._values
+        result_arr = DynamicArray()
+        append = result_arr.append
+
+        for key in keys:
+            index, found = find_slot(key, hash_function(key))
+            append(values[index] if found is True else None)
+
+        return result_arr
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of the given iterable from the hash map. Missing keys are
+        ignored. The table is shrunk at most once, after the last key.
+
+        :params: keys: an iterable of keys
+
+        :return: None
+        """
+        hash_function = self._hash_function
+        find_slot = self._find_slot
+        removed = 0
+
+        for key in keys:
+            index, found = find_slot(key, hash_function(key))
+            if found is True:
+                self._remove_at(index)
+                removed += 1
+
+        if removed > 0 and self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
+
+    def reserve(self, count: int) -> None:
+        """
+        This method reserves room for count more insertions, such as a bulk load about to be
+        made with put. Afterwards the load factor
+        stays below 0.5 and the occupancy below max_occupancy even if every key is new, so the
+        insertions need no checks of their own.
+
+        :params: count: the number of keys about to be inserted
+
+        :return: None
+        """
+        needed = 2 * (self._size + count) + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
+        elif (self._size + self._tombstones + count) / self._capacity >= self._max_occupancy:
+            self.compact()
+
+    def _reserve_slot(self, key: str, hash_val: int) -> (int, bool):
+        """
+        This method prepares the hash map for writing the given key. It grows or compacts the
+        table if needed and returns the index of the bucket holding the key, or the index where
+        the key should be inserted, together with whether the key was found.
+
+        :params: key: the key of the entry we are writing
+                 hash_val: the hash of the key
+
+        :return: a tuple of the bucket index and True if the key is already in the hash map
+        """
+        # resize table if load factor greater than 0.5, rebuild it in place if tombstones
+        # have filled it up
+        if self._size / self._capacity >= 0.5:
+            self.resize_table(2 * self._capacity)
+        elif (self._size + self._tombstones) / self._capacity >= self._max_occupancy:
+            self.compact()
+
+        return self._find_slot(key, hash_val)
+
+    def _find_slot(self, key: str, hash_val: int) -> (int, bool):
+        """
+        This method walks the probe sequence of the given key a single time. If the key is in the
+        hash map it returns the index of its bucket and True. Otherwise it returns the index where
+        the key should be inserted, which is the first tombstone passed while probing or the empty
+        bucket that ended the probe (-1 if the probe sequence has no free bucket at all), and False.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: a tuple of the bucket index and whether the key was found
+        """
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        capacity = self._capacity
+
+        # get initial index
+        init_index = hash_val % capacity
+        index = init_index
+        first_tombstone = -1
+        j = 1
+
+        # walk the probe sequence until an empty bucket or the live bucket for the key
+        state = states[index]
+        while state != _EMPTY:
+            if state == _TOMBSTONE:
+                # remember the first reusable bucket but keep looking for the key
+                if first_tombstone == -1:
+                    first_tombstone = index
+            elif hashes[index] == hash_val and keys[index] == key:
+                return index, True
+            if j == capacity:
+                # the probe sequence repeats from here on, every reachable bucket has been seen
+                index = -1
+                break
+            index = (init_index + (j * j)) % capacity
+            j += 1
+            state = states[index]
+
+        # key is absent, prefer reusing a tombstone over the empty bucket
+        if first_tombstone != -1:
+            index = first_tombstone
+        return index, False
+
+    def _insert_at(self, index: int, key: str, value: object, hash_val: int) -> None:
+        """
+        This method stores a new key/value pair in a free bucket returned by _find_slot().
+
+        :params: index: the index of an empty or tombstone bucket
+                 key: the key to store
+                 value: the value to store
+                 hash_val: the hash of the key
+
+        :returns: None
+        """
+        if self._states[index] == _TOMBSTONE:
+            self._tombstones -= 1
+        self._states[index] = _LIVE
+        self._hashes[index] = hash_val
+        self._keys[index] = key
+        self._values[index] = value
+        self._size += 1
+        self._version += 1
+
+    def _remove_at(self, index: int) -> None:
+        """
+        This method turns the live bucket at the given index into a tombstone and releases its
+        key and value.
+
+        :params: index: the index of a live bucket
+
+        :returns: None
+        """
+        self._states[index] = _TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._tombstones += 1
+        self._size -= 1
+        self._version += 1
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor.
+
+        :params:
+
+        :return: the current hash table load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table. Tombstones count as
+        empty, so this is every bucket without a live entry.
+
+        :params:
+
+        :return: the number of empty buckets in the hash table.
+        """
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        This method returns the bucket statistics of the hash table, all read from counters the
+        hash map keeps up to date.
+
+        :params:
+
+        :return: a dict with size, capacity, table_load, empty_buckets (tombstones included),
+                 occupied_buckets (live entries) and tombstones
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self._size / self._capacity,
+            'empty_buckets': self._capacity - self._size,
+            'occupied_buckets': self._size,
+            'tombstones': self._tombstones,
+        }
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        This method returns an immutable copy of the hash map laid out as a minimal perfect hash
+        table: one slot per key and a single probe per lookup, see hash_map_frozen. The hash map
+        itself is left unchanged.
+
+        :params:
+
+        :return: a FrozenHashMap holding the same key/value pairs
+        """
+        return FrozenHashMap(self.items(), self._hash_function)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method changes the capacity of the internal hash table.
+
+        :params: new_capacity: the new capacity of the hash table
+
+        :returns: None
+        """
+        if new_capacity < self._size:
+            return
+
+        # keep the old arrays, their contents are copied bucket by bucket
+        old_capacity = self._capacity
+        old_hashes = self._hashes
+        old_states = self._states
+        old_keys = self._keys
+        old_values = self._values
+
+        # determine prime capacity
+        if is_prime(new_capacity):
+            self._capacity = new_capacity
+        else:
+            self._capacity = next_prime(new_capacity)
+
+        # grow until the copied entries keep the load factor below 0.5
+        while self._size > 0 and (self._size - 1) / self._capacity >= 0.5:
+            self._capacity = next_prime(2 * self._capacity)
+
+        self._allocate(self._capacity)
+        self._tombstones = 0
+        self._version += 1
+
+        # copy every live bucket into the first empty bucket of its new probe sequence
+        hashes = self._hashes
+        states = self._states
+        keys = self._keys
+        values = self._values
+        capacity = self._capacity
+        for index in range(old_capacity):
+            if old_states[index] != _LIVE:
+                continue
+
+            hash_val = old_hashes[index]
+            init_index = hash_val % capacity
+            new_index = init_index
+            j = 1
+            while states[new_index] != _EMPTY:
+                new_index = (init_index + (j * j)) % capacity
+                j += 1
+            states[new_index] = _LIVE
+            hashes[new_index] = hash_val
+            keys[new_index] = old_keys[index]
+            values[new_index] = old_values[index]
+
+    def compact(self) -> None:
+        """
+        This method rebuilds the hash table at its current capacity, dropping every tombstone so
+        probe sequences end at the first empty bucket again.
+
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(self._capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        This method shrinks the hash table to the smallest prime capacity that holds the current
+        entries within the load factor limit.
+
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(max(self._size, 1))
+
+    def _shrink_table(self) -> None:
+        """
+        This method shrinks the hash table after remove() drops the load factor below the low
+        water mark. The new capacity leaves the table half as loaded as the grow limit, but never
+        goes below the initial capacity.
+
+        :params:
+
+        :returns: None
+        """
+        new_capacity = next_prime(max(self._min_capacity, 4 * self._size))
+        if new_capacity < self._capacity:
+            self.resize_table(new_capacity)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+
+        :params: key: the key we are looking for
+
+        :returns: the value associated with the given key. If the key is not in the hash
+                  map, the method returns None.
+        """
+        return self._get_hashed(key, self._hash_function(key))
+
+    def _get_hashed(self, key: str, hash_val: int) -> object:
+        """
+        This method is get() for a key whose hash under the hash function of the map is already
+        known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the value associated with the key, or None
+        """
+        index, found = self._find_slot(key, hash_val)
+        if found is True:
+            return self._values[index]
+        else:
+            return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False. An
+        empty hash map does not contain any keys.
+
+        :params: key: the key we are looking for
+
+        :returns: True if the given key is in the hash map, otherwise it returns False
+        """
+        if self._size == 0:
+            return False
+
+        return self._contains_hashed(key, self._hash_function(key))
+
+    def _contains_hashed(self, key: str, hash_val: int) -> bool:
+        """
+        This method is contains_key() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        return self._find_slot(key, hash_val)[1]
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map.
+
+        :params: key: the key we are looking for
+
+        :returns: None
+        """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        This method is remove() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        if self._size == 0:
+            return
+
+        index, found = self._find_slot(key, hash_val)
+        if found is False:
+            return
+
+        self._remove_at(index)
+
+        if self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map. It does not change the underlying hash
+        table capacity, unless shrinking is enabled, in which case the table goes back to its
+        initial capacity
+
+        :params:
+
+        :returns:
+        """
+        if self._min_load_factor > 0:
+            self._capacity = self._min_capacity
+
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+
+        :params:
+
+        :return: a dynamic array where each index contains a tuple of key/value pairs
+        """
+        result_arr = DynamicArray()
+        states = self._states
+        for index in range(self._capacity):
+            if states[index] == _LIVE:
+                result_arr.append((self._keys[index], self._values[index]))
+
+        return result_arr
+
+    def _live_slots(self):
+        """
+        This method iterates over the indices of the live buckets. Inserting or removing a key,
+        or resizing the table, while an iteration is running makes the iteration raise a
+        RuntimeError at its next step; replacing the value of an existing key does not.
+
+        :params:
+
+        :return: a generator of bucket indices
+        """
+        version = self._version
+        states = self._states
+
+        for index in range(self._capacity):
+            if states[index] == _LIVE:
+                yield index
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def __iter__(self):
+        """
+        This method iterates over the live entries of the hash map, for the callers that need
+        .key, .value and .hash of every entry (hash_map_mmap.write_map, merges). The table holds
+        no entry objects, so each one is built on the fly; keys(), values() and items() read
+        the arrays directly and build none.
+
+        :params:
+
+        :return: a generator of the entries in the hash map
+        """
+        for index in self._live_slots():
+            yield HashEntry(self._keys[index], self._values[index], self._hashes[index])
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return _CompactKeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return _CompactValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return _CompactItemsView(self)
+
+
+class _CompactKeysView(KeysView):
+    """
+    Keys view reading the key list of a compact map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the keys of the hash map
+        """
+        hash_map = self._map
+        for index in hash_map._live_slots():
+            yield hash_map._keys[index]
+
+
+class _CompactValuesView(ValuesView):
+    """
+    Values view reading the value list of a compact map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the values of the hash map
+        """
+        hash_map = self._map
+        for index in hash_map._live_slots():
+            yield hash_map._values[index]
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Return True if any key of the hash map holds the value, by scanning every entry
+        """
+        for item in self:
+            if item == value:
+                return True
+        return False
+
+
+class _CompactItemsView(ItemsView):
+    """
+    Items view reading the key and value lists of a compact map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the (key, value) tuples of the hash map
+        """
+        hash_map = self._map
+        for index in hash_map._live_slots():
+            yield hash_map._keys[index], hash_map._values[index]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str10'), m.contains_key('str10'))
+    m.remove('str10')
+    print(m.get('str10'), m.contains_key('str10'), m.get_size())
+
+    print("\nresize")
+    print("------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\niteration")
+    print("---------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+
+    print("\nbatch operations and views")
+    print("--------------------------")
+    import hash_map_oa
+    m = hash_map_oa.HashMap(11, hash_function_1, compact=True)
+    print(type(m).__module__)
+    m.put_many([('key' + str(i), i) for i in range(1000)])
+    m.remove_many(['key' + str(i) for i in range(0, 1000, 2)])
+    print(m.get_many(['key1', 'key2']), m.stats())
+    print(len(m.keys()), 'key3' in m.keys(), 3 in m.values(), ('key5', 5) in m.items(),
+          sorted(m.items())[:2])
+    try:
+        for key in m.keys():
+            m.put(key + '!', 0)
+    except RuntimeError as error:
+        print(error)
@@ -0,0 +1,302 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Parallel bulk build of hash maps on a process pool, returning either one merged
+#              map or a map sharded by key hash
+
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import hash_map_sc_flat
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_include import ItemsView, KeysView, ValuesView
+
+# the input of a build in progress split by shard, inherited by forked workers instead of
+# being sent to them
+_INPUT = None
+
+
+def shard_of(key: str, shards: int) -> int:
+    """
+    This function returns the shard of the given key. It uses the CRC-32 of the key rather than
+    the map's hash function: it runs in C, so splitting the input costs little next to hashing
+    it, and the keys of one shard do not all share a remainder of the map's hash that the
+    bucket index inside the shard would then repeat.
+
+    :params: key: the key
+             shards: the number of shards
+
+    :return: the index of the shard
+    """
+    return zlib.crc32(key.encode('utf-8')) % shards
+
+
+def _split(pairs: list, shards: int) -> list:
+    """
+    This function splits the input by shard in a single pass.
+
+    :params: pairs: the (key, value) tuples
+             shards: the number of shards
+
+    :return: a list with the (key, value) tuples of every shard, in input order
+    """
+    crc32 = zlib.crc32
+    parts = [[] for _ in range(shards)]
+    for pair in pairs:
+        parts[crc32(pair[0].encode('utf-8')) % shards].append(pair)
+    return parts
+
+
+def _build_shard(shard: int, function: callable, map_class: type, capacity: int,
+                 options: dict, pairs: list = None):
+    """
+    This function hashes the keys of one shard and builds its map in a worker.
+
+    :params: shard: the index of the shard
+             function: the hash function of the map
+             map_class: the HashMap class to build
+             capacity: the initial capacity of the shard
+             options: further keyword arguments for map_class
+             pairs: the pairs of the shard, or None to use the ones inherited from the parent
+
+    :return: the shard map
+    """
+    if pairs is None:
+        pairs = _INPUT[shard]
+    hash_map = map_class(capacity, function, **options)
+    hash_map.put_many(pairs, [function(pair[0]) for pair in pairs])
+    return hash_map
+
+
+def parallel_build(pairs, function: callable = hash_function_1,
+                   map_class: type = hash_map_sc_flat.HashMap, workers: int = None,
+                   shards: int = None, merge: bool = False, capacity: int = 11, **options):
+    """
+    This function builds a hash map from a large input on a process pool, one shard per task.
+    The parent splits the input by shard in one pass (see shard_of()), and each worker hashes
+    the keys of its own shard and builds the shard map with put_many(). Where processes are
+    started by forking, the workers inherit the split input instead of receiving a copy of it;
+    elsewhere every task is sent the pairs of its shard only.
+
+    By default the shards come back as a ShardedHashMap. The parent then only unpickles them,
+    which for the default hash_map_sc_flat engine, whose state is a few arrays and lists, runs
+    no Python code per entry. Shards of hash_map_sc or hash_map_oa are rebuilt entry by entry
+    as they arrive, which is serial work in the parent.
+
+    With merge, the shard maps are built the same way and then moved into one map_class map
+    with merge_from(), which reuses the hashes computed by the workers and never compares keys.
+    Splitting, unpickling and merging run in the parent, so only the hashing and the shard
+    builds can use more than one CPU. The number of shards also changes the chain lengths
+    inside the shards, so compare timings at the same number of shards.
+
+    A key given more than once keeps its last value, as with put() in input order. function and
+    map_class must be importable by the workers (module level), and the maps cannot be
+    instrumented or durable.
+
+    :params: pairs: an iterable of (key, value) tuples
+             function: the hash function of the map
+             map_class: a HashMap class with put_many(pairs, hashes) and merge_from()
+             workers: the number of worker processes, by default one per CPU
+             shards: the number of shards, by default one per worker
+             merge: True for one merged map, False for a ShardedHashMap
+             capacity: the initial capacity of the merged map and of every shard
+             options: further keyword arguments for map_class
+
+    :return: a ShardedHashMap, or a map_class map if merge is True
+    """
+    global _INPUT
+
+    if options.get('instrument', False) is True:
+        raise ValueError("instrumented maps cannot be built in parallel")
+    if options.get('durable') is not None:
+        raise ValueError("durable maps cannot be built in parallel, the shards would share a log")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if shards is None:
+        shards = workers
+    if not isinstance(pairs, list):
+        pairs = list(pairs)
+
+    parts = _split(pairs, shards)
+
+    # forked workers see the split input as it is now, nothing is sent
+    context = None
+    sent = parts
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        sent = [None] * shards
+        _INPUT = parts
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(_build_shard, shard, function, map_class, capacity,
+                                       options, sent[shard])
+                       for shard in range(shards)]
+            shard_maps = [future.result() for future in futures]
+    finally:
+        _INPUT = None
+
+    if merge is False:
+        return ShardedHashMap(shard_maps, function)
+
+    hash_map = map_class(capacity, function, **options)
+    hash_map.merge_from(*shard_maps)
+    return hash_map
+
+
+class ShardedHashMap:
+    def __init__(self, shards: list, function: callable = hash_function_1) -> None:
+        """
+        Initialize a hash map made of the given shard maps. Every key must be in the shard
+        picked by shard_of(), as parallel_build() leaves them.
+        """
+        self._shards = shards
+        self._hash_function = function
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(shard.get_size() for shard in self._shards)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the sum of the shard capacities
+        """
+        return sum(shard.get_capacity() for shard in self._shards)
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    def get_shards(self) -> list:
+        """
+        Return the list of shard maps
+        """
+        return self._shards
+
+    # ------------------------------------------------------------------ #
+
+    def _shard(self, key: str):
+        """
+        Return the shard map responsible for the given key
+        """
+        return self._shards[shard_of(key, len(self._shards))]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the shard of the key, adding it if it is new.
+
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+
+        :return: None
+        """
+        self._shard(key).put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key, or None if the key is not
+        in the hash map.
+
+        :params: key: the key we are looking for
+
+        :return: the value associated with the key, or None
+        """
+        return self._shard(key).get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False.
+
+        :params: key: the key we are looking for
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        return self._shard(key).contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map.
+
+        :params: key: the key we are looking for
+
+        :return: None
+        """
+        self._shard(key).remove(key)
+
+    def clear(self) -> None:
+        """
+        This method clears every shard.
+
+        :params:
+
+        :return: None
+        """
+        for shard in self._shards:
+            shard.clear()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map, shard by shard.
+
+        :params:
+
+        :return: a dynamic array where each index contains a tuple of key/value pairs
+        """
+        result_arr = DynamicArray()
+        for entry in self:
+            result_arr.append((entry.key, entry.value))
+        return result_arr
+
+    def __iter__(self):
+        """
+        Return a generator of the entries (with .key and .value) of every shard in turn
+        """
+        for shard in self._shards:
+            yield from shard
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+    import hash_map_sc
+
+    pairs = [('key' + str(i % 40000), i) for i in range(50000)]
+    expected = {key: value for key, value in pairs}
+
+    for map_class, options in ((hash_map_sc_flat.HashMap, {}), (hash_map_sc.HashMap, {}),
+                               (hash_map_oa.HashMap, {'probing': 'double'})):
+        for merge in (False, True):
+            m = parallel_build(pairs, hash_function_2, map_class, workers=4, merge=merge,
+                               **options)
+            print(map_class.__module__, type(m).__name__, m.get_size(),
+                  all(m.get(key) == value for key, value in expected.items()),
+                  m.get('missing'))
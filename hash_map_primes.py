@@ -0,0 +1,119 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Prime capacities for the hash maps, from a precomputed growth table or a
+#              deterministic Miller-Rabin test
+
+# each prime is the first prime at or above twice the one before it, starting from the default
+# capacity 11, so a table doubling from 11 never has to search for its next capacity
+GROWTH_PRIMES = (
+    11, 23, 47, 97, 197, 397, 797, 1597, 3203, 6421, 12853, 25717, 51437, 102877, 205759,
+    411527, 823117, 1646237, 3292489, 6584983, 13169977, 26339969, 52679969, 105359939,
+    210719881, 421439783, 842879579, 1685759167, 3371518343, 6743036717, 13486073473,
+    26972146961, 53944293929, 107888587883, 215777175787, 431554351609, 863108703229,
+    1726217406467, 3452434812973, 6904869625999, 13809739252051, 27619478504183,
+    55238957008387, 110477914016779, 220955828033581, 441911656067171, 883823312134381,
+    1767646624268779, 3535293248537579, 7070586497075177, 14141172994150357, 28282345988300791,
+    56564691976601587, 113129383953203213, 226258767906406483, 452517535812813007,
+    905035071625626043, 1810070143251252131, 3620140286502504283, 7240280573005008577,
+)
+
+# twice a growth prime maps straight to the next one
+_DOUBLED = {2 * prime: following for prime, following in zip(GROWTH_PRIMES, GROWTH_PRIMES[1:])}
+
+# Miller-Rabin with these bases is exact for every number below 3.3 * 10 ** 24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_prime(capacity: int) -> bool:
+    """
+    This function determines whether the given integer is a prime number. Small factors are
+    ruled out by division, everything else by a deterministic Miller-Rabin test, so the cost
+    grows with the number of digits instead of with the square root of the number.
+
+    :params: capacity: the integer to test
+
+    :return: True if capacity is prime, otherwise False
+    """
+    if capacity < 2:
+        return False
+
+    for witness in _WITNESSES:
+        if capacity % witness == 0:
+            return capacity == witness
+
+    # write capacity - 1 as d * 2^s with d odd
+    d = capacity - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for witness in _WITNESSES:
+        x = pow(witness, d, capacity)
+        if x == 1 or x == capacity - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % capacity
+            if x == capacity - 1:
+                break
+        else:
+            # witness proves capacity composite
+            return False
+
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    This function returns the first odd prime at or above the given integer, the same result
+    as the _next_prime() method of the hash maps. Doubled growth primes are answered from the
+    table, any other request is searched with is_prime().
+
+    :params: capacity: the requested capacity
+
+    :return: the first odd prime greater than or equal to capacity
+    """
+    if capacity in _DOUBLED:
+        return _DOUBLED[capacity]
+
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    from math import isqrt
+
+    print([capacity for capacity in range(50) if is_prime(capacity)])
+    print(next_prime(2), next_prime(22), next_prime(53), next_prime(106), next_prime(10 ** 9))
+
+    def trial_division(number: int) -> bool:
+        """
+        Plain trial division, independent of is_prime() and of the growth table
+        """
+        return number >= 2 and all(number % factor for factor in range(2, isqrt(number) + 1))
+
+    def next_prime_by_trial(capacity: int) -> int:
+        """
+        The first odd prime at or above capacity, found by trial division
+        """
+        capacity += 1 - capacity % 2
+        while not trial_division(capacity):
+            capacity += 2
+        return capacity
+
+    # trial division is checked as far as it stays fast, growth primes up to 10 ** 12
+    checked = [prime for prime in GROWTH_PRIMES if prime <= 10 ** 12]
+    print(len(checked), all(trial_division(prime) for prime in checked),
+          all(next_prime(2 * prime) == next_prime_by_trial(2 * prime) == following
+              for prime, following in zip(checked, GROWTH_PRIMES[1:])))
@@ -0,0 +1,164 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Probe sequence strategies for the open addressing hash map
+
+from a6_include import hash_function_1, hash_function_2
+
+
+class LinearProbing:
+    """
+    Probe sequence init, init + 1, init + 2, ...
+
+    Every strategy is described by two things: the step taken after the first collision, and
+    how much the step grows after each further collision. Probing then only needs an addition
+    per bucket: index = (index + step) % capacity, step += growth.
+    """
+    growth = 0
+
+    # Robin Hood displacement only works on top of a linear sequence
+    robin_hood = False
+
+    def first_step(self, key: str, capacity: int) -> int:
+        """
+        Return the step taken after the first collision of the given key
+        """
+        return 1
+
+    def step_growth(self, power_of_two: bool) -> int:
+        """
+        Return the step growth to use on prime (False) or power of two (True) capacities
+        """
+        return self.growth
+
+    def for_function(self, function: callable) -> "LinearProbing":
+        """
+        Return the strategy to use in a map whose bucket index comes from the given function
+        """
+        return self
+
+
+class QuadraticProbing(LinearProbing):
+    """
+    Probe sequence init, init + 1, init + 4, init + 9, ... (steps 1, 3, 5, ...)
+
+    On a prime capacity this reaches half of the buckets. On a power of two capacity the
+    triangular numbers init, init + 1, init + 3, init + 6, ... (steps 1, 2, 3, ...) are used
+    instead, which reach every bucket.
+    """
+    growth = 2
+
+    def step_growth(self, power_of_two: bool) -> int:
+        """
+        Return the step growth to use on prime (False) or power of two (True) capacities
+        """
+        if power_of_two is True:
+            return 1
+        return self.growth
+
+
+class DoubleHashing(LinearProbing):
+    """
+    Probe sequence init, init + s, init + 2s, ... where the step s is derived from a second
+    hash function. On a prime capacity every step visits every bucket, on a power of two
+    capacity every odd step does.
+    """
+
+    def __init__(self, function: callable = None) -> None:
+        """
+        Initialize double hashing with the hash function used for the step. By default the step
+        comes from whichever of hash_function_1 and hash_function_2 the map does not use for
+        its bucket index, see for_function().
+        """
+        self._function = function
+
+    def for_function(self, function: callable) -> "DoubleHashing":
+        """
+        This method returns double hashing for a map whose bucket index comes from the given
+        function, with the step function picked if none was given. A step taken from the same
+        function as the index would give every key colliding on a hash the same step too, so
+        that is rejected.
+
+        :params: function: the hash function of the map
+
+        :return: a DoubleHashing strategy with a step function other than function
+        """
+        step_function = self._function
+        if step_function is None:
+            step_function = hash_function_1 if function is hash_function_2 else hash_function_2
+        if step_function is function:
+            raise ValueError("double hashing needs a step hash function other than the hash "
+                             "function of the map")
+
+        if step_function is self._function:
+            return self
+        return DoubleHashing(step_function)
+
+    def first_step(self, key: str, capacity: int) -> int:
+        """
+        Return the step taken after the first collision of the given key, in [1, capacity - 1]
+        """
+        if capacity <= 2:
+            return 1
+        if capacity & (capacity - 1) == 0:
+            return (self._function(key) | 1) & (capacity - 1)
+        return 1 + self._function(key) % (capacity - 1)
+
+
+class RobinHoodProbing(LinearProbing):
+    """
+    Linear probing where an insertion takes the bucket of any entry closer to its home bucket
+    than the new entry is to its own, and removal shifts the following entries back instead of
+    leaving a tombstone. Probe lengths stay close to the average and lookups of missing keys
+    stop early.
+    """
+    robin_hood = True
+
+
+PROBING_STRATEGIES = {
+    'linear': LinearProbing,
+    'quadratic': QuadraticProbing,
+    'double': DoubleHashing,
+    'robin_hood': RobinHoodProbing,
+}
+
+
+def get_probing(probing) -> LinearProbing:
+    """
+    This function returns the probing strategy for the given name, or the given object itself
+    if it already is a strategy.
+
+    :params: probing: one of the names in PROBING_STRATEGIES, or a strategy object
+
+    :return: a probing strategy object
+    """
+    if isinstance(probing, str):
+        if probing not in PROBING_STRATEGIES:
+            raise ValueError(f"unknown probing strategy {probing!r}, expected one of "
+                             f"{', '.join(PROBING_STRATEGIES)}")
+        return PROBING_STRATEGIES[probing]()
+
+    return probing
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+
+    # the step function is the other assignment function, whichever the map uses
+    for function in (hash_function_1, hash_function_2):
+        strategy = get_probing('double').for_function(function)
+        m = hash_map_oa.HashMap(11, function, probing='double')
+        for i in range(1000):
+            m.put('key' + str(i), i)
+        print(function.__name__, strategy._function.__name__,
+              all(m.get('key' + str(i)) == i for i in range(1000)))
+
+    try:
+        hash_map_oa.HashMap(11, hash_function_2, probing=DoubleHashing(hash_function_2))
+    except ValueError as error:
+        print(error)
@@ -6,29 +6,126 @@
 # Description: Hash map using separate chaining
 
 
-from a6_include import (DynamicArray, LinkedList,
+from a6_include import (DynamicArray,
                         hash_function_1, hash_function_2)
+from hash_map_frozen import FrozenHashMap
+from hash_map_include import ItemsView, KeysView, ValuesView, get_chain_type
+from hash_map_instrument import MapStats, instrument_chaining, instrumented_chain_type
+from hash_map_primes import is_prime, next_prime
+from hash_map_wal import WriteAheadLog, make_durable
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental_resize: bool = False,
+                 migrate_step: int = 4,
+                 min_load_factor: float = 0.0,
+                 max_load_factor: float = 1.0,
+                 growth_factor: float = 2.0,
+                 power_of_two: bool = False,
+                 chain_order: str = 'fixed',
+                 instrument: bool = False,
+                 durable=None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        put() grows the table by growth_factor once the load factor reaches max_load_factor.
+        Capacities are primes, or with power_of_two powers of two indexed with a bit mask.
+
+        With incremental_resize, a put() that crosses the load factor limit allocates the
+        larger table but leaves the nodes in the old one; each following put(), get(),
+        contains_key() and remove() migrates the old bucket of its key plus migrate_step
+        more, so only the new table ever has to be searched. The larger table itself is built
+        ahead of time: once a resize is near, every put() adds a few buckets to it, so no single
+        operation allocates a whole table.
+
+        Empty buckets all share one empty chain, replaced by a chain of their own on the first
+        insertion, so an empty bucket costs no object.
+
+        With a min_load_factor above zero, remove() shrinks the table once the load factor
+        drops below it (keep it well under half of max_load_factor so a shrunk table is not
+        grown straight back) and clear() returns the table to its initial capacity.
+
+        chain_order picks how each chain organizes itself: 'fixed' links new keys at the front
+        and never reorders, 'move_to_front' moves a key to the front of its chain whenever it is
+        found, 'transpose' swaps it one step forward instead, and 'sorted' keeps every chain in
+        hash order so a lookup of a missing key stops early.
+
+        With instrument, the map records the number of chain nodes read by every lookup, the
+        number of resizes and the time spent in resize_table(), see get_instrumentation(). Maps
+        created without it run no instrumentation code at all.
+
+        With durable (a hash_map_wal.WriteAheadLog, or the path of one), the map first recovers
+        the contents saved in the log files and then logs every change it makes, see get_wal().
+        Maps created without it run no logging code at all.
         """
+        if max_load_factor <= 0:
+            raise ValueError("max_load_factor must be greater than 0")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+
+        self._max_load_factor = max_load_factor
+        self._growth_factor = growth_factor
+        self._power_of_two = power_of_two
+        self._chain_type = get_chain_type(chain_order)
+
+        # chains of an instrumented map record their searches, so the chain class is swapped
+        # before any bucket is built
+        self._instrumentation = None
+        if instrument is True:
+            self._instrumentation = MapStats()
+            self._chain_type = instrumented_chain_type(self._chain_type, self._instrumentation)
+
+        # held by every empty bucket and never modified, see _chain_for_insert()
+        self._empty_chain = self._chain_type()
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number (or a power of two)
+        if power_of_two is True:
+            self._capacity = self._round_capacity(capacity)
+        else:
+            self._capacity = next_prime(capacity)
         for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+            self._buckets.append(self._empty_chain)
 
         self._hash_function = function
         self._size = 0
 
+        # number of buckets with a non empty chain, kept up to date by every insertion and
+        # removal so empty_buckets() does not scan the table
+        self._occupied = 0
+
+        # shrinking never goes below the initial capacity
+        self._min_load_factor = min_load_factor
+        self._min_capacity = self._capacity
+
+        # state of an incremental resize, _old_buckets is None when none is in progress
+        self._incremental = incremental_resize
+        self._migrate_step = migrate_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._old_occupied = 0
+        self._migrate_index = 0
+
+        # buckets of the table the next incremental resize will switch to, filled by put() as
+        # the resize nears; None when not started
+        self._next_buckets = None
+        self._next_capacity = 0
+
+        # bumped by every insertion, removal and resize so iterators can detect them
+        self._version = 0
+
+        if self._instrumentation is not None:
+            instrument_chaining(self, self._instrumentation)
+
+        self._wal = None
+        if durable is not None:
+            self._wal = make_durable(self, durable)
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -72,6 +169,32 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        This method rounds a requested capacity up to the next power of two, or to the next
+        prime if the map does not use power of two capacities.
+
+        :params: capacity: the requested capacity
+
+        :return: the capacity the table will actually have
+        """
+        if self._power_of_two is True:
+            rounded = 2
+            while rounded < capacity:
+                rounded *= 2
+            return rounded
+
+        if is_prime(capacity):
+            return capacity
+        return next_prime(capacity)
+
+    def _grown_capacity(self) -> int:
+        """
+        Return the capacity requested when the table grows, at least one bucket more than now
+        so a small growth_factor cannot round back to the current capacity
+        """
+        return max(self._capacity + 1, int(self._capacity * self._growth_factor))
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -86,6 +209,12 @@ class HashMap:
         """
         return self._capacity
 
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
@@ -99,40 +228,273 @@ class HashMap:
 
         :return: None
         """
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method is put() for a key whose hash under the hash function of the map is already
+        known (see hash_map_concurrent).
+
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+                 hash_val: the hash of the key
 
-        # resize table if load factor greater or equal to 1.0
-        if self._size / self._capacity >= 1.0:
-            self.resize_table(2 * self._capacity)
+        :return: None
+        """
+        # resize table if load factor greater or equal to the maximum
+        if self._size / self._capacity >= self._max_load_factor:
+            self._rebuild_table(self._grown_capacity())
+        elif self._incremental is True:
+            self._pregrow()
         # get initial index
-        hash_val = self._hash_function(key)
-        index = hash_val % self._capacity
+        if self._old_buckets is not None:
+            self._migrate_for(hash_val)
+        index = hash_val & (self._capacity - 1) if self._power_of_two else hash_val % self._capacity
 
         # find the node at that matches the key
         linked_list = self._buckets.get_at_index(index)
-        node_if_contains_key = linked_list.contains(key)
+        node_if_contains_key = linked_list.contains(key, hash_val)
         # if node matches key replace that nodes value with new value, otherwise
         # add node to linked list
         if node_if_contains_key is not None:
             node_if_contains_key.value = value
         else:
-            linked_list.insert(key, value)
+            if linked_list.length() == 0:
+                self._occupied += 1
+                linked_list = self._chain_for_insert(self._buckets, index)
+            linked_list.insert(key, value, hash_val)
             self._size += 1
+            self._version += 1
+
+    def put_many(self, pairs, hashes=None) -> None:
+        """
+        This method puts every key/value pair of the given iterable into the hash map. The table
+        is sized once for the whole input up front, so no pair triggers a resize and the
+        per-pair load factor checks of put() are skipped.
+
+        :params: pairs: an iterable of (key, value) tuples
+                 hashes: optionally the hash of every key, in order, as computed by this map's
+                         hash function (see hash_map_vectorized.hash_keys)
+
+        :return: None
+        """
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        self.reserve(len(pairs))
+
+        if hashes is None:
+            hash_function = self._hash_function
+            hashes = [hash_function(pair[0]) for pair in pairs]
+
+        # pull the lookups out of the per-pair path
+        buckets = self._buckets
+        capacity = self._capacity
+        size = self._size
+
+        for (key, value), hash_val in zip(pairs, hashes):
+            index = hash_val % capacity
+            linked_list = buckets.get_at_index(index)
+            node = linked_list.contains(key, hash_val)
+            if node is not None:
+                node.value = value
+            else:
+                if linked_list.length() == 0:
+                    self._occupied += 1
+                    linked_list = self._chain_for_insert(buckets, index)
+                linked_list.insert(key, value, hash_val)
+                size += 1
+
+        if size != self._size:
+            self._version += 1
+        self._size = size
+
+    def merge_from(self, *others) -> None:
+        """
+        This method moves every entry of the other hash maps into this one, which must be
+        empty. All maps must use the same hash function and no two may hold the same key, as
+        with the shards of a hash_map_parallel.ShardedHashMap. The table is sized once for all
+        of them and the entries are moved with their cached hash, without hashing or comparing
+        any key. The other maps are left empty.
+
+        :params: others: hash maps of this class to empty into this one
+
+        :return: None
+        """
+        # the moved entries are not checked against keys already here
+        if self._size > 0:
+            raise ValueError("merge_from needs an empty map to merge into")
+        for other in others:
+            if other.get_hash_function() is not self._hash_function:
+                raise ValueError("merged maps must use the same hash function")
+
+        self.reserve(sum(other.get_size() for other in others))
+        self._version += 1
+        for other in others:
+            other._finish_migration()
+            self._rehash(other._buckets)
+            self._size += other.get_size()
+            other.clear()
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of the given iterable.
+
+        :params: keys: an iterable of keys
+
+        :return: a dynamic array holding, in order, the value of each key or None if it is missing
+        """
+        self._finish_migration()
+
+        buckets = self._buckets
+        capacity = self._capacity
+        hash_function = self._hash_function
+        result_arr = DynamicArray()
+        append = result_arr.append
+
+        for key in keys:
+            hash_val = hash_function(key)
+            node = buckets.get_at_index(hash_val % capacity).contains(key, hash_val)
+            append(None if node is None else node.value)
+
+        return result_arr
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of the given iterable from the hash map. Missing keys are
+        ignored. The table is shrunk at most once, after the last key.
+
+        :params: keys: an iterable of keys
+
+        :return: None
+        """
+        self._finish_migration()
+
+        buckets = self._buckets
+        capacity = self._capacity
+        hash_function = self._hash_function
+        removed = 0
+
+        for key in keys:
+            hash_val = hash_function(key)
+            linked_list = buckets.get_at_index(hash_val % capacity)
+            if linked_list.remove(key, hash_val) is True:
+                removed += 1
+                if linked_list.length() == 0:
+                    self._occupied -= 1
+
+        self._size -= removed
+        if removed > 0:
+            self._version += 1
+        if removed > 0 and self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
+
+    def reserve(self, count: int) -> None:
+        """
+        This method reserves room for count more insertions, such as a bulk load about to be
+        made with put. Afterwards the load factor
+        stays below max_load_factor before every insertion even if every key is new, so the
+        insertions need no checks of their own.
+
+        :params: count: the number of keys about to be inserted
+
+        :return: None
+        """
+        self._finish_migration()
+
+        needed = int((self._size + count) / self._max_load_factor) + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
 
     def empty_buckets(self) -> int:
         """
-        This method returns the number of empty buckets in the hash table.
+        This method returns the number of empty buckets in the hash table. During an
+        incremental resize it counts the buckets of the new table that will still be empty once
+        every node has migrated.
 
         :params:
 
         return: number of empty buckets
         """
-        count = 0
-        # determine count of buckets that are empty
-        for index in range(self._buckets.length()):
-            if self._buckets.get_at_index(index).length() == 0:
-                count += 1
+        if self._old_buckets is None or self._old_occupied == 0:
+            return self._capacity - self._occupied
+
+        # during an incremental resize, an empty new bucket that nodes not yet migrated will
+        # land in counts as occupied; only the old buckets left to migrate are walked
+        filled = set()
+        buckets = self._buckets
+        capacity = self._capacity
+        for index in range(self._migrate_index, self._old_capacity):
+            linked_list = self._old_buckets.get_at_index(index)
+            if linked_list is None:
+                continue
+            for node in linked_list:
+                new_index = node.hash % capacity
+                if buckets.get_at_index(new_index).length() == 0:
+                    filled.add(new_index)
+        return capacity - self._occupied - len(filled)
+
+    def stats(self) -> dict:
+        """
+        This method returns the bucket statistics of the hash table, all read from counters the
+        hash map keeps up to date. Chaining leaves no tombstones, the key is there so the result
+        has the same shape as for hash_map_oa.
+
+        :params:
+
+        :return: a dict with size, capacity, table_load, empty_buckets, occupied_buckets and
+                 tombstones
+        """
+        empty = self.empty_buckets()
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self._size / self._capacity,
+            'empty_buckets': empty,
+            'occupied_buckets': self._capacity - empty,
+            'tombstones': 0,
+        }
+
+    def get_instrumentation(self) -> MapStats:
+        """
+        Return the statistics recorded by an instrumented map, or None if instrument is off
+        """
+        return self._instrumentation
+
+    def get_wal(self) -> WriteAheadLog:
+        """
+        Return the write ahead log of a durable map, or None if durable is off
+        """
+        return self._wal
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        This method returns an immutable copy of the hash map laid out as a minimal perfect hash
+        table: one slot per key and a single probe per lookup, see hash_map_frozen. The hash map
+        itself is left unchanged.
 
-        return count
+        :params:
+
+        :return: a FrozenHashMap holding the same key/value pairs
+        """
+        return FrozenHashMap(self.items(), self._hash_function)
+
+    def chain_length_histogram(self) -> dict:
+        """
+        This method scans the hash table for the length of every chain. A long tail points at a
+        poor hash function for the keys being stored.
+
+        :params:
+
+        :return: a dict from chain length to the number of buckets with a chain of that length
+        """
+        self._finish_migration()
+
+        histogram = {}
+        for index in range(self._capacity):
+            length = self._buckets[index].length()
+            histogram[length] = histogram.get(length, 0) + 1
+
+        return dict(sorted(histogram.items()))
 
     def table_load(self) -> float:
         """
@@ -147,17 +509,30 @@ class HashMap:
     def clear(self) -> None:
         """
         This method clears the contents of the hash map. It does not change the underlying hash
-        table capacity
+        table capacity, unless shrinking is enabled, in which case the table goes back to its
+        initial capacity
 
         :params:
 
         :returns:
         """
-        # replace every linked list in buckets with an empty linked list
-        for index in range(self._buckets.length()):
-            self._buckets.set_at_index(index, LinkedList())
+        # drop any incremental resize in progress along with its nodes
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._old_occupied = 0
 
         self._size = 0
+        self._occupied = 0
+        self._version += 1
+
+        # go back to the initial capacity if shrinking is enabled
+        if self._min_load_factor > 0 and self._capacity != self._min_capacity:
+            self._set_capacity(self._min_capacity)
+            return
+
+        # point every bucket back at the shared empty chain
+        for index in range(self._buckets.length()):
+            self._buckets.set_at_index(index, self._empty_chain)
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -167,30 +542,229 @@ class HashMap:
 
         :returns: None
         """
-        # create a copy of the buckets
-        arr = DynamicArray()
-        for index in range(self._buckets.length()):
-            arr.append(self._buckets.get_at_index(index))
-
         if new_capacity < 1:
             return
+
+        # an explicit resize always completes synchronously
+        self._finish_migration()
+
+        # keep a reference to the old buckets, their nodes are moved rather than re-put
+        old_buckets = self._buckets
+        self._set_capacity(new_capacity)
+
+        # move all nodes from the old capacity buckets to the new capacity buckets
+        self._rehash(old_buckets)
+
+    def shrink_to_fit(self) -> None:
+        """
+        This method shrinks the hash table to the smallest prime capacity that holds the current
+        entries within the load factor limit.
+
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(max(self._size, 1))
+
+    def _shrink_table(self) -> None:
+        """
+        This method shrinks the hash table after remove() drops the load factor below the low
+        water mark. The new capacity leaves the table at half of max_load_factor, but never goes
+        below the initial capacity.
+
+        :params:
+
+        :returns: None
+        """
+        new_capacity = self._round_capacity(
+            max(self._min_capacity, int(2 * self._size / self._max_load_factor)))
+        if new_capacity < self._capacity:
+            self._rebuild_table(new_capacity)
+
+    def _set_capacity(self, new_capacity: int) -> None:
+        """
+        This method replaces the buckets with an empty table of at least new_capacity buckets.
+        The capacity is rounded up to a prime (or power of two), and grown by growth_factor until
+        the nodes currently in the hash map keep the load factor below max_load_factor once
+        moved in.
+
+        :params: new_capacity: the requested capacity of the hash table
+
+        :returns: None
+        """
         # determine next prime capacity and replace the capacity with it
-        if self._is_prime(new_capacity):
-            self._capacity = new_capacity
+        self._version += 1
+        self._capacity = self._round_capacity(new_capacity)
+
+        # grow until the moved nodes keep the load factor below the maximum, which is the
+        # capacity re-inserting them one at a time through put() would end up with
+        while self._size > 0 and (self._size - 1) / self._capacity >= self._max_load_factor:
+            self._capacity = self._round_capacity(self._grown_capacity())
+
+        # empty all buckets and resize capacity, taking over the table put() has been building
+        # for an incremental resize when it has this capacity
+        self._occupied = 0
+        if self._next_buckets is not None and self._next_capacity == self._capacity:
+            self._buckets = self._next_buckets
         else:
-            self._capacity = self._next_prime(new_capacity)
+            self._buckets = DynamicArray()
+        self._next_buckets = None
+        while self._buckets.length() < self._capacity:
+            self._buckets.append(self._empty_chain)
 
-        # empty all buckets and resize capacity
-        self._size = 0
-        self._buckets = DynamicArray()
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+    def _pregrow(self) -> None:
+        """
+        This method spreads the allocation of the table of the next incremental resize over the
+        puts leading up to it. Once the puts left before the resize are no more than a quarter
+        of the capacity, each put appends just enough buckets to have the whole table ready
+        when the resize comes.
 
-        # copy all values from the old capacity bucket to the new capacity bucket
-        for index in range(arr.length()):
-            linked_list = arr.get_at_index(index)
-            for node in linked_list:
-                self.put(node.key, node.value)
+        :params:
+
+        :returns: None
+        """
+        left = int(self._capacity * self._max_load_factor) - self._size
+        if left > self._capacity // 4:
+            return
+
+        if self._next_buckets is None:
+            self._next_buckets = DynamicArray()
+            self._next_capacity = self._round_capacity(self._grown_capacity())
+        missing = self._next_capacity - self._next_buckets.length()
+        step = -(-missing // max(1, left))
+        for _ in range(min(step, missing)):
+            self._next_buckets.append(self._empty_chain)
+
+    def _chain_for_insert(self, buckets: DynamicArray, index: int):
+        """
+        This method returns the chain of the bucket at the given index ready for an insertion.
+        A bucket still holding the shared empty chain is given a chain of its own first.
+
+        :params: buckets: the bucket array
+                 index: the index of the bucket
+
+        :return: the chain of the bucket
+        """
+        linked_list = buckets.get_at_index(index)
+        if linked_list is self._empty_chain:
+            linked_list = self._chain_type()
+            buckets.set_at_index(index, linked_list)
+        return linked_list
+
+    def _rehash(self, old_buckets: DynamicArray) -> None:
+        """
+        This method moves every node of old_buckets into the current (empty) buckets. The keys
+        are known to be distinct, so each node is relinked straight into its new chain using its
+        cached hash, without the load factor and contains checks of put() or a new allocation.
+
+        :params: old_buckets: the buckets of the table before the resize
+
+        :returns: None
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        occupied = self._occupied
+
+        for index in range(old_buckets.length()):
+            for node in old_buckets.get_at_index(index):
+                new_index = node.hash % capacity
+                linked_list = buckets.get_at_index(new_index)
+                if linked_list.length() == 0:
+                    occupied += 1
+                    linked_list = self._chain_for_insert(buckets, new_index)
+                linked_list.insert_node(node)
+
+        self._occupied = occupied
+
+    def _rebuild_table(self, new_capacity: int) -> None:
+        """
+        This method grows the hash table when put() crosses the load factor limit, or shrinks it
+        when remove() crosses the low water mark. Without incremental resizing this is a plain
+        resize_table(). With it, the current buckets are kept as the old table and their nodes
+        are migrated a few buckets at a time by the following operations.
+
+        :params: new_capacity: the new capacity of the hash table
+
+        :returns: None
+        """
+        if self._incremental is False:
+            self.resize_table(new_capacity)
+            return
+
+        # only one migration runs at a time
+        self._finish_migration()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._old_occupied = self._occupied
+        self._migrate_index = 0
+        self._set_capacity(new_capacity)
+
+    def _migrate_for(self, hash_val: int) -> None:
+        """
+        This method advances an incremental resize on behalf of an operation on a key with the
+        given hash. The old bucket of that key is migrated first so the operation only has to
+        look at the new buckets, then migrate_step more old buckets are migrated in order.
+
+        :params: hash_val: the hash of the key being operated on
+
+        :returns: None
+        """
+        self._migrate_bucket(hash_val % self._old_capacity)
+        self._migrate_buckets(self._migrate_step)
+
+    def _migrate_bucket(self, index: int) -> None:
+        """
+        This method moves the nodes of the old bucket at the given index into the new buckets.
+        Migrated old buckets are set to None.
+
+        :params: index: the index of the old bucket
+
+        :returns: None
+        """
+        linked_list = self._old_buckets.get_at_index(index)
+        if linked_list is None:
+            return
+
+        if linked_list.length() > 0:
+            self._old_occupied -= 1
+        for node in linked_list:
+            new_index = node.hash % self._capacity
+            new_list = self._buckets.get_at_index(new_index)
+            if new_list.length() == 0:
+                self._occupied += 1
+                new_list = self._chain_for_insert(self._buckets, new_index)
+            new_list.insert_node(node)
+        self._old_buckets.set_at_index(index, None)
+
+    def _migrate_buckets(self, count: int) -> None:
+        """
+        This method migrates the next count old buckets in order. Once every old bucket has been
+        visited the old table is released.
+
+        :params: count: the number of old buckets to visit
+
+        :returns: None
+        """
+        stop = min(self._migrate_index + count, self._old_capacity)
+        for index in range(self._migrate_index, stop):
+            self._migrate_bucket(index)
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+    def _finish_migration(self) -> None:
+        """
+        This method completes any incremental resize in progress.
+
+        :params:
+
+        :returns: None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._old_capacity)
 
     def get(self, key: str):
         """
@@ -202,13 +776,26 @@ class HashMap:
         :returns: the value associated with the given key. If the key is not in the hash
                   map, the method returns None.
         """
+        return self._get_hashed(key, self._hash_function(key))
+
+    def _get_hashed(self, key: str, hash_val: int) -> object:
+        """
+        This method is get() for a key whose hash under the hash function of the map is already
+        known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the value associated with the key, or None
+        """
         # determine index which contains the linked list with the key
-        hash_val = self._hash_function(key)
-        index = hash_val % self._capacity
+        if self._old_buckets is not None:
+            self._migrate_for(hash_val)
+        index = hash_val & (self._capacity - 1) if self._power_of_two else hash_val % self._capacity
 
         # find the node with the key
         linked_list = self._buckets.get_at_index(index)
-        node = linked_list.contains(key)
+        node = linked_list.contains(key, hash_val)
 
         # return None if it does not exist or the value of the node
         if node is None:
@@ -228,9 +815,22 @@ class HashMap:
         if self._size == 0:
             return False
 
+        return self._contains_hashed(key, self._hash_function(key))
+
+    def _contains_hashed(self, key: str, hash_val: int) -> bool:
+        """
+        This method is contains_key() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
         # determine index which contains the linked list with the key
-        hash_val = self._hash_function(key)
-        index = hash_val % self._capacity
+        if self._old_buckets is not None:
+            self._migrate_for(hash_val)
+        index = hash_val & (self._capacity - 1) if self._power_of_two else hash_val % self._capacity
         # if index is outside the range of valid index return False
         if index < 0 or index >= self._capacity:
             return False
@@ -238,7 +838,7 @@ class HashMap:
         linked_list = self._buckets.get_at_index(index)
 
         # if linked list has key return True otherwise return false
-        if linked_list.contains(key) is None:
+        if linked_list.contains(key, hash_val) is None:
             return False
         else:
             return True
@@ -251,18 +851,36 @@ class HashMap:
 
         :returns: None
         """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        This method is remove() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: None
+        """
         # determine index which contains the linked list with the key
-        hash_val = self._hash_function(key)
-        index = hash_val % self._capacity
+        if self._old_buckets is not None:
+            self._migrate_for(hash_val)
+        index = hash_val & (self._capacity - 1) if self._power_of_two else hash_val % self._capacity
         # if index is outside the range of valid index return
         if index < 0 or index >= self._capacity:
             return
         # get linked list at the index which contains the key
         linked_list = self._buckets.get_at_index(index)
         # remove the node which contains key
-        removed = linked_list.remove(key)
+        removed = linked_list.remove(key, hash_val)
         if removed is True:
+            if linked_list.length() == 0:
+                self._occupied -= 1
             self._size -= 1
+            self._version += 1
+            if self._size / self._capacity < self._min_load_factor:
+                self._shrink_table()
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -274,6 +892,8 @@ class HashMap:
         :return: a dynamic array where each index contains a tuple of key/value pairs
 
         """
+        self._finish_migration()
+
         # create result array
         arr = DynamicArray()
         # store key value pair tuples of all nodes in the mape in the result array
@@ -284,6 +904,122 @@ class HashMap:
 
         return arr
 
+    def export_chunks(self, chunk_size: int = 4096):
+        """
+        This method streams the contents of the hash map in chunks, scanning the buckets once.
+        Each chunk is a pair of lists, the keys and the values, so no tuple is built per node,
+        and every chunk but the last holds exactly chunk_size pairs. Inserting or removing a
+        key, or resizing the table, between chunks makes the export raise a RuntimeError.
+
+        :params: chunk_size: the largest number of pairs in a chunk
+
+        :return: a generator of (keys, values) tuples of lists with the same length
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self._finish_migration()
+        version = self._version
+        buckets = self._buckets
+
+        keys = []
+        values = []
+        for index in range(self._capacity):
+            linked_list = buckets[index]
+            length = linked_list.length()
+            if length == 0:
+                continue
+            if len(keys) + length < chunk_size:
+                for node in linked_list:
+                    keys.append(node.key)
+                    values.append(node.value)
+                continue
+
+            # the chain ends a chunk, so its nodes are collected first and reordering lookups
+            # between chunks cannot skip or repeat a node
+            for node in list(linked_list):
+                keys.append(node.key)
+                values.append(node.value)
+                if len(keys) == chunk_size:
+                    yield keys, values
+                    if self._version != version:
+                        raise RuntimeError("hash map changed during export")
+                    keys = []
+                    values = []
+
+        if len(keys) > 0:
+            yield keys, values
+
+    def export_into(self, keys, values, start: int = 0) -> int:
+        """
+        This method writes the keys and values of the hash map into preallocated buffers, from
+        position start on, scanning the buckets once. The pair written at a position is the key
+        in keys and the value in values at that position.
+
+        :params: keys: a sequence supporting item assignment (list, array, ...) for the keys
+                 values: a sequence supporting item assignment for the values
+                 start: the first position to write
+
+        :return: the number of pairs written, which is the size of the hash map
+        """
+        if len(keys) - start < self._size or len(values) - start < self._size:
+            raise ValueError("buffers are too small for the contents of the hash map")
+
+        self._finish_migration()
+        buckets = self._buckets
+
+        position = start
+        for index in range(self._capacity):
+            for node in buckets[index]:
+                keys[position] = node.key
+                values[position] = node.value
+                position += 1
+
+        return position - start
+
+    def __iter__(self):
+        """
+        This method iterates over the nodes of the hash map, which have .key and .value like the
+        entries of hash_map_oa. Each call returns an independent generator, so iterations can be
+        nested. The nodes of a chain are collected before any is handed out, so lookups that
+        reorder chains do not disturb a running iteration. Inserting or removing a key, or
+        resizing the table, makes the iteration raise a RuntimeError at its next step.
+
+        :params:
+
+        :return: a generator of the nodes in the hash map
+        """
+        self._finish_migration()
+        version = self._version
+        buckets = self._buckets
+
+        for index in range(self._capacity):
+            linked_list = buckets[index]
+            if linked_list.length() == 0:
+                continue
+            for node in list(linked_list):
+                yield node
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return ItemsView(self)
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -527,3 +1263,40 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nexport_chunks")
+    print("-------------")
+    m = HashMap(11, hash_function_1, chain_order='move_to_front', max_load_factor=8.0)
+    for i in range(500):
+        m.put('key' + str(i), i)
+    exported = []
+    for keys, values in m.export_chunks(64):
+        print(len(keys), end=' ')
+        exported.extend(keys)
+        # lookups reorder chains between chunks
+        for i in range(0, 500, 7):
+            m.get('key' + str(i))
+    print(sorted(exported) == sorted(m.keys()))
+
+    print("\nincremental resize latency")
+    print("--------------------------")
+    import gc
+    import time
+
+    def spread_hash(key: str) -> int:
+        return int(key) * 2654435761 % 4294967296
+
+    def slowest_put(incremental: bool) -> float:
+        m = HashMap(11, spread_hash, incremental_resize=incremental)
+        slowest = 0.0
+        # collector pauses would land on arbitrary puts
+        gc.disable()
+        for i in range(100000):
+            start = time.perf_counter()
+            m.put(str(i), i)
+            slowest = max(slowest, time.perf_counter() - start)
+        gc.enable()
+        return slowest
+
+    # no put of an incremental map should come near the cost of a whole resize
+    print(slowest_put(True) < slowest_put(False) / 4)
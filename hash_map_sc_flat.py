@@ -0,0 +1,882 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Hash map using separate chaining, with the chains stored as index links in
+#              flat arrays instead of one linked list object per bucket. It has the API of
+#              hash_map_sc.HashMap except incremental resizing, chain orders, power of two
+#              capacities, instrumentation and durability.
+
+from array import array
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_frozen import FrozenHashMap
+from hash_map_include import HashEntry, ItemsView, KeysView, ValuesView
+from hash_map_primes import is_prime, next_prime
+
+# end of a chain, and the head of a bucket with no chain
+_NO_SLOT = -1
+
+
+class HashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 min_load_factor: float = 0.0) -> None:
+        """
+        Initialize new HashMap that uses
+        separate chaining for collision resolution
+
+        Each bucket is one int in the heads array('q'), the index of the first slot of its chain
+        or -1 if the bucket is empty. Slots live in four parallel arrays: the index of the next
+        slot of the chain and the key hash in two array('q')s, and the keys and values in two
+        lists. An empty bucket costs 8 bytes and no object, and a removed slot is reused by the
+        next insertion. Hash functions must return values that fit in a signed 64 bit integer.
+
+        min_load_factor works as in hash_map_sc.HashMap. The load factor limit is fixed at 1.0,
+        new keys are always linked at the front of their chain, and incremental resizing,
+        instrumentation and durability are not available in this engine.
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._heads = array('q', [_NO_SLOT]) * self._capacity
+        self._allocate_slots()
+
+        self._hash_function = function
+        self._size = 0
+
+        # number of buckets with a chain, so empty_buckets() needs no scan
+        self._occupied = 0
+
+        # shrinking never goes below the initial capacity
+        self._min_load_factor = min_load_factor
+        self._min_capacity = self._capacity
+
+        # bumped by every insertion, removal and resize so iterators can detect them
+        self._version = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            nodes = ['(' + str(self._keys[slot]) + ': ' + str(self._values[slot]) + ')'
+                     for slot in self._chain(i)]
+            out += str(i) + ': SLL [' + ' -> '.join(nodes) + ']\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_hash_function(self) -> callable:
+        """
+        Return hash function of map
+        """
+        return self._hash_function
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate_slots(self) -> None:
+        """
+        This method replaces the slot arrays with empty ones.
+
+        :params:
+
+        :returns: None
+        """
+        self._next = array('q')
+        self._hashes = array('q')
+        self._keys = []
+        self._values = []
+
+        # removed slots are chained through _next, starting at _free
+        self._free = _NO_SLOT
+
+    def _chain(self, index: int):
+        """
+        This method iterates over the slots of the chain of the bucket at the given index.
+
+        :params: index: the index of the bucket
+
+        :return: a generator of slot indices, from the head of the chain
+        """
+        slot = self._heads[index]
+        while slot != _NO_SLOT:
+            yield slot
+            slot = self._next[slot]
+
+    def _find_slot(self, key: str, hash_val: int, index: int) -> int:
+        """
+        This method walks the chain of the bucket at the given index, comparing hashes before
+        keys.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+                 index: the index of the bucket of the key
+
+        :return: the slot holding the key, or -1 if the key is not in the hash map
+        """
+        hashes = self._hashes
+        keys = self._keys
+        next_slots = self._next
+
+        slot = self._heads[index]
+        while slot != _NO_SLOT:
+            if hashes[slot] == hash_val and keys[slot] == key:
+                return slot
+            slot = next_slots[slot]
+        return _NO_SLOT
+
+    def _link_new(self, index: int, key: str, value: object, hash_val: int) -> None:
+        """
+        This method stores a new key/value pair in a free slot, reusing a removed one if there
+        is any, and links it at the front of the chain of the bucket at the given index.
+
+        :params: index: the index of the bucket of the key
+                 key: the key to store
+                 value: the value to store
+                 hash_val: the hash of the key
+
+        :returns: None
+        """
+        if self._heads[index] == _NO_SLOT:
+            self._occupied += 1
+
+        slot = self._free
+        if slot != _NO_SLOT:
+            self._free = self._next[slot]
+            self._next[slot] = self._heads[index]
+            self._hashes[slot] = hash_val
+            self._keys[slot] = key
+            self._values[slot] = value
+        else:
+            slot = len(self._keys)
+            self._next.append(self._heads[index])
+            self._hashes.append(hash_val)
+            self._keys.append(key)
+            self._values.append(value)
+
+        self._heads[index] = slot
+        self._size += 1
+        self._version += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value must be replaced with the new value. If the given key is
+        not in the hash map, a new key/value pair is be added.
+
+        :param: key: the key of the entry we are storing
+                value: the value of associated
+
+        :return: None
+        """
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        This method is put() for a key whose hash under the hash function of the map is already
+        known (see hash_map_concurrent).
+
+        :params: key: the key of the entry we are storing
+                 value: the value associated with it
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        # resize table if load factor greater or equal to 1.0
+        if self._size / self._capacity >= 1.0:
+            self.resize_table(2 * self._capacity)
+
+        # get initial index
+        index = hash_val % self._capacity
+
+        # if the key is in its chain replace the value, otherwise link a new slot in
+        slot = self._find_slot(key, hash_val, index)
+        if slot != _NO_SLOT:
+            self._values[slot] = value
+        else:
+            self._link_new(index, key, value, hash_val)
+
+    def put_many(self, pairs, hashes=None) -> None:
+        """
+        This method puts every key/value pair of the given iterable into the hash map. The table
+        is sized once for the whole input up front, so no pair triggers a resize.
+
+        :params: pairs: an iterable of (key, value) tuples
+                 hashes: optionally the hash of every key, in order, as computed by this map's
+                         hash function (see hash_map_vectorized.hash_keys)
+
+        :return: None
+        """
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        self.reserve(len(pairs))
+
+        if hashes is None:
+            hash_function = self._hash_function
+            hashes = [hash_function(pair[0]) for pair in pairs]
+
+        capacity = self._capacity
+        for (key, value), hash_val in zip(pairs, hashes):
+            index = hash_val % capacity
+            slot = self._find_slot(key, hash_val, index)
+            if slot != _NO_SLOT:
+                self._values[slot] = value
+            else:
+                self._link_new(index, key, value, hash_val)
+
+    def reserve(self, count: int) -> None:
+        """
+        This method reserves room for count more insertions, such as a bulk load about to be
+        made with put. Afterwards the load factor stays at most 1 even if every key is new, so
+        none of the insertions triggers a resize.
+
+        :params: count: the number of keys about to be inserted
+
+        :return: None
+        """
+        needed = self._size + count + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
+
+    def merge_from(self, *others) -> None:
+        """
+        This method moves every entry of the other hash maps into this one, which must be
+        empty. All maps must use the same hash function and no two may hold the same key, as
+        with the shards of a hash_map_parallel.ShardedHashMap. The slot arrays of the other maps
+        are appended to this map's whole when they have no removed slots, and the chains are
+        then linked in one pass over the hashes, without hashing or comparing any key. The other
+        maps are left empty.
+
+        :params: others: hash maps of this class to empty into this one
+
+        :return: None
+        """
+        # the moved slots are not checked against keys already here
+        if self._size > 0:
+            raise ValueError("merge_from needs an empty map to merge into")
+        for other in others:
+            if other.get_hash_function() is not self._hash_function:
+                raise ValueError("merged maps must use the same hash function")
+
+        size = sum(other.get_size() for other in others)
+        if size + 1 > self._capacity:
+            self._capacity = next_prime(size + 1)
+        self._heads = array('q', [_NO_SLOT]) * self._capacity
+        self._allocate_slots()
+
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        for other in others:
+            if other._free == _NO_SLOT:
+                hashes.extend(other._hashes)
+                keys.extend(other._keys)
+                values.extend(other._values)
+            else:
+                # removed slots are left behind
+                for slot in other._live_slots():
+                    hashes.append(other._hashes[slot])
+                    keys.append(other._keys[slot])
+                    values.append(other._values[slot])
+            other.clear()
+
+        # link every slot at the front of its chain
+        heads = self._heads
+        next_slots = array('q', [_NO_SLOT]) * len(keys)
+        capacity = self._capacity
+        occupied = 0
+        for slot in range(len(keys)):
+            index = hashes[slot] % capacity
+            head = heads[index]
+            if head == _NO_SLOT:
+                occupied += 1
+            else:
+                next_slots[slot] = head
+            heads[index] = slot
+
+        self._next = next_slots
+        self._size = size
+        self._occupied = occupied
+        self._version += 1
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of the given iterable.
+
+        :params: keys: an iterable of keys
+
+        :return: a dynamic array holding, in order, the value of each key or None if it is missing
+        """
+        capacity = self._capacity
+        hash_function = self._hash_function
+        values = self._values
+        result_arr = DynamicArray()
+
+        for key in keys:
+            hash_val = hash_function(key)
+            slot = self._find_slot(key, hash_val, hash_val % capacity)
+            result_arr.append(None if slot == _NO_SLOT else values[slot])
+
+        return result_arr
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of the given iterable from the hash map. Missing keys are
+        ignored. The table is shrunk at most once, after the last key.
+
+        :params: keys: an iterable of keys
+
+        :return: None
+        """
+        hash_function = self._hash_function
+        removed = 0
+
+        for key in keys:
+            if self._unlink(key, hash_function(key)) is True:
+                removed += 1
+
+        if removed > 0 and self._size / self._capacity < self._min_load_factor:
+            self._shrink_table()
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table.
+
+        :params:
+
+        return: number of empty buckets
+        """
+        return self._capacity - self._occupied
+
+    def stats(self) -> dict:
+        """
+        This method returns the bucket statistics of the hash table, all read from counters the
+        hash map keeps up to date. Chaining leaves no tombstones, the key is there so the result
+        has the same shape as for hash_map_oa.
+
+        :params:
+
+        :return: a dict with size, capacity, table_load, empty_buckets, occupied_buckets and
+                 tombstones
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self._size / self._capacity,
+            'empty_buckets': self._capacity - self._occupied,
+            'occupied_buckets': self._occupied,
+            'tombstones': 0,
+        }
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        This method returns an immutable copy of the hash map laid out as a minimal perfect hash
+        table: one slot per key and a single probe per lookup, see hash_map_frozen. The hash map
+        itself is left unchanged.
+
+        :params:
+
+        :return: a FrozenHashMap holding the same key/value pairs
+        """
+        return FrozenHashMap(self.items(), self._hash_function)
+
+    def chain_length_histogram(self) -> dict:
+        """
+        This method scans the hash table for the length of every chain. A long tail points at a
+        poor hash function for the keys being stored.
+
+        :params:
+
+        :return: a dict from chain length to the number of buckets with a chain of that length
+        """
+        histogram = {}
+        for index in range(self._capacity):
+            length = 0
+            for _ in self._chain(index):
+                length += 1
+            histogram[length] = histogram.get(length, 0) + 1
+
+        return dict(sorted(histogram.items()))
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor.
+
+        :params:
+
+        :return: the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map. It does not change the underlying hash
+        table capacity, unless shrinking is enabled, in which case the table goes back to its
+        initial capacity. No per bucket objects are allocated, the heads array is refilled in
+        one step and the slots are dropped.
+
+        :params:
+
+        :returns:
+        """
+        if self._min_load_factor > 0:
+            self._capacity = self._min_capacity
+
+        self._heads = array('q', [_NO_SLOT]) * self._capacity
+        self._allocate_slots()
+        self._size = 0
+        self._occupied = 0
+        self._version += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method changes the capacity of the internal hash table. The live slots are copied
+        into fresh slot arrays as they are relinked, which also drops any removed slots.
+
+        :params: new_capacity: the new capacity of the hash table
+
+        :returns: None
+        """
+        if new_capacity < 1:
+            return
+
+        # keep the old arrays, the chains are walked bucket by bucket
+        old_capacity = self._capacity
+        old_heads = self._heads
+        old_next = self._next
+        old_hashes = self._hashes
+        old_keys = self._keys
+        old_values = self._values
+
+        # determine prime capacity
+        if is_prime(new_capacity):
+            self._capacity = new_capacity
+        else:
+            self._capacity = next_prime(new_capacity)
+
+        # grow until the moved slots keep the load factor below 1.0
+        while self._size > 0 and (self._size - 1) / self._capacity >= 1.0:
+            self._capacity = next_prime(2 * self._capacity)
+
+        self._heads = array('q', [_NO_SLOT]) * self._capacity
+        self._allocate_slots()
+        self._version += 1
+
+        # link every slot at the front of its new chain, in the order hash_map_sc relinks nodes
+        heads = self._heads
+        next_slots = self._next
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        capacity = self._capacity
+        occupied = 0
+        for index in range(old_capacity):
+            old_slot = old_heads[index]
+            while old_slot != _NO_SLOT:
+                hash_val = old_hashes[old_slot]
+                new_index = hash_val % capacity
+                if heads[new_index] == _NO_SLOT:
+                    occupied += 1
+                next_slots.append(heads[new_index])
+                heads[new_index] = len(keys)
+                hashes.append(hash_val)
+                keys.append(old_keys[old_slot])
+                values.append(old_values[old_slot])
+                old_slot = old_next[old_slot]
+        self._occupied = occupied
+
+    def shrink_to_fit(self) -> None:
+        """
+        This method shrinks the hash table to the smallest prime capacity that holds the current
+        entries within the load factor limit.
+
+        :params:
+
+        :returns: None
+        """
+        self.resize_table(max(self._size, 1))
+
+    def _shrink_table(self) -> None:
+        """
+        This method shrinks the hash table after remove() drops the load factor below the low
+        water mark. The new capacity leaves the table at half of the load factor limit, but never
+        goes below the initial capacity.
+
+        :params:
+
+        :returns: None
+        """
+        new_capacity = next_prime(max(self._min_capacity, 2 * self._size))
+        if new_capacity < self._capacity:
+            self.resize_table(new_capacity)
+
+    def get(self, key: str):
+        """
+        This method returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+
+        :params: key: the key we are looking for
+
+        :returns: the value associated with the given key. If the key is not in the hash
+                  map, the method returns None.
+        """
+        return self._get_hashed(key, self._hash_function(key))
+
+    def _get_hashed(self, key: str, hash_val: int) -> object:
+        """
+        This method is get() for a key whose hash under the hash function of the map is already
+        known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: the value associated with the key, or None
+        """
+        slot = self._find_slot(key, hash_val, hash_val % self._capacity)
+        if slot == _NO_SLOT:
+            return None
+        else:
+            return self._values[slot]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False. An
+        empty hash map does not contain any keys.
+
+        :params: key: the key we are looking for
+
+        :returns: True if the given key is in the hash map, otherwise it returns False
+        """
+        if self._size == 0:
+            return False
+
+        return self._contains_hashed(key, self._hash_function(key))
+
+    def _contains_hashed(self, key: str, hash_val: int) -> bool:
+        """
+        This method is contains_key() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if the given key is in the hash map, otherwise False
+        """
+        return self._find_slot(key, hash_val, hash_val % self._capacity) != _NO_SLOT
+
+    def _unlink(self, key: str, hash_val: int) -> bool:
+        """
+        This method unlinks the slot holding the given key from its chain and puts it on the
+        free list, releasing its key and value.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: True if a slot was removed, otherwise False
+        """
+        index = hash_val % self._capacity
+        next_slots = self._next
+
+        previous = _NO_SLOT
+        slot = self._heads[index]
+        while slot != _NO_SLOT:
+            if self._hashes[slot] == hash_val and self._keys[slot] == key:
+                if previous == _NO_SLOT:
+                    self._heads[index] = next_slots[slot]
+                    if next_slots[slot] == _NO_SLOT:
+                        self._occupied -= 1
+                else:
+                    next_slots[previous] = next_slots[slot]
+
+                next_slots[slot] = self._free
+                self._free = slot
+                self._keys[slot] = None
+                self._values[slot] = None
+                self._size -= 1
+                self._version += 1
+                return True
+            previous = slot
+            slot = next_slots[slot]
+        return False
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map.
+
+        :params: key: the key we are looking for
+
+        :returns: None
+        """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        This method is remove() for a key whose hash under the hash function of the map is
+        already known.
+
+        :params: key: the key we are looking for
+                 hash_val: the hash of the key
+
+        :return: None
+        """
+        if self._unlink(key, hash_val) is True:
+            if self._size / self._capacity < self._min_load_factor:
+                self._shrink_table()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+
+        :params:
+
+        :return: a dynamic array where each index contains a tuple of key/value pairs
+        """
+        result_arr = DynamicArray()
+        for index in range(self._capacity):
+            for slot in self._chain(index):
+                result_arr.append((self._keys[slot], self._values[slot]))
+
+        return result_arr
+
+    def export_chunks(self, chunk_size: int = 4096):
+        """
+        This method streams the contents of the hash map in chunks, scanning the buckets once.
+        Each chunk is a pair of lists, the keys and the values, so no tuple is built per slot,
+        and every chunk but the last holds exactly chunk_size pairs. Inserting or removing a
+        key, or resizing the table, between chunks makes the export raise a RuntimeError.
+
+        :params: chunk_size: the largest number of pairs in a chunk
+
+        :return: a generator of (keys, values) tuples of lists with the same length
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        version = self._version
+        keys = []
+        values = []
+        for index in range(self._capacity):
+            for slot in self._chain(index):
+                keys.append(self._keys[slot])
+                values.append(self._values[slot])
+                if len(keys) == chunk_size:
+                    yield keys, values
+                    if self._version != version:
+                        raise RuntimeError("hash map changed during export")
+                    keys = []
+                    values = []
+
+        if len(keys) > 0:
+            yield keys, values
+
+    def export_into(self, keys, values, start: int = 0) -> int:
+        """
+        This method writes the keys and values of the hash map into preallocated buffers, from
+        position start on, scanning the buckets once. The pair written at a position is the key
+        in keys and the value in values at that position.
+
+        :params: keys: a sequence supporting item assignment (list, array, ...) for the keys
+                 values: a sequence supporting item assignment for the values
+                 start: the first position to write
+
+        :return: the number of pairs written, which is the size of the hash map
+        """
+        if len(keys) - start < self._size or len(values) - start < self._size:
+            raise ValueError("buffers are too small for the contents of the hash map")
+
+        position = start
+        for index in range(self._capacity):
+            for slot in self._chain(index):
+                keys[position] = self._keys[slot]
+                values[position] = self._values[slot]
+                position += 1
+
+        return position - start
+
+    def _live_slots(self):
+        """
+        This method iterates over the slots of the hash map bucket by bucket. Inserting or
+        removing a key, or resizing the table, while an iteration is running makes the
+        iteration raise a RuntimeError at its next step; replacing the value of an existing key
+        does not.
+
+        :params:
+
+        :return: a generator of slot indices
+        """
+        version = self._version
+        for index in range(self._capacity):
+            for slot in self._chain(index):
+                yield slot
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def __iter__(self):
+        """
+        This method iterates over the entries of the hash map bucket by bucket, for the callers
+        that need .key, .value and .hash of every entry (hash_map_mmap.write_map, merges). The
+        table keeps no entry objects, so each one is handed out as a new HashEntry; keys(),
+        values() and items() read the arrays directly and build none.
+
+        :params:
+
+        :return: a generator of the entries of the map
+        """
+        for slot in self._live_slots():
+            yield HashEntry(self._keys[slot], self._values[slot], self._hashes[slot])
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys of the hash map
+        """
+        return _FlatKeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values of the hash map
+        """
+        return _FlatValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs of the hash map
+        """
+        return _FlatItemsView(self)
+
+
+class _FlatKeysView(KeysView):
+    """
+    Keys view reading the key list of a flat map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the keys of the hash map
+        """
+        hash_map = self._map
+        for slot in hash_map._live_slots():
+            yield hash_map._keys[slot]
+
+
+class _FlatValuesView(ValuesView):
+    """
+    Values view reading the value list of a flat map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the values of the hash map
+        """
+        hash_map = self._map
+        for slot in hash_map._live_slots():
+            yield hash_map._values[slot]
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Return True if any key of the hash map holds the value, by scanning every entry
+        """
+        for item in self:
+            if item == value:
+                return True
+        return False
+
+
+class _FlatItemsView(ItemsView):
+    """
+    Items view reading the key and value lists of a flat map directly.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Return a generator of the (key, value) tuples of the hash map
+        """
+        hash_map = self._map
+        for slot in hash_map._live_slots():
+            yield hash_map._keys[slot], hash_map._values[slot]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str10'), m.contains_key('str10'))
+    m.remove('str10')
+    print(m.get('str10'), m.contains_key('str10'), m.get_size())
+
+    print("\nresize")
+    print("------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nclear")
+    print("-----")
+    m = HashMap(7, hash_function_1)
+    m.put('key1', 10)
+    m.put('key2', 20)
+    m.put('key3', 30)
+    m.remove('key2')
+    print(m)
+    m.clear()
+    print(m.get_size(), m.get_capacity(), m.empty_buckets())
+
+    print("\nviews, stats and merge")
+    print("----------------------")
+    shards = [HashMap(11, hash_function_1) for _ in range(3)]
+    for i in range(300):
+        shards[i % 3].put('key' + str(i), i)
+    shards[0].remove('key0')
+    m = HashMap(11, hash_function_1)
+    m.merge_from(*shards)
+    print(m.get_size(), [shard.get_size() for shard in shards], m.get('key299'), m.get('key0'))
+    print(m.stats(), m.empty_buckets())
+    print(len(m.keys()), 'key3' in m.keys(), 3 in m.values(), ('key5', 5) in m.items(),
+          sorted(m.items())[:2], [len(keys) for keys, _ in m.export_chunks(128)])
+    try:
+        for key in m.keys():
+            m.put(key + '!', 0)
+    except RuntimeError as error:
+        print(error)
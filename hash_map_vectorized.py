@@ -0,0 +1,126 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Batched hashing of string keys with NumPy, feeding the bulk insert path of
+#              both hash maps
+
+from a6_include import hash_function_1, hash_function_2
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional, every function below falls back to the scalar hash functions
+    np = None
+
+
+def hash_keys(keys, function, chunk_size: int = 65536, max_width: int = 256) -> list:
+    """
+    This function hashes every key of the given sequence. hash_function_1 and hash_function_2
+    are computed in vectorized form when NumPy is available, chunk_size keys at a time: the
+    keys of a chunk are grouped by length into the widths 8, 16, 32, ... up to max_width, and
+    each group is laid out as a zero padded matrix of code points, so hash_function_1 is a row
+    sum and hash_function_2 a product with the weights 1, 2, 3, ... Padding contributes zero
+    to both, so the results equal the scalar functions exactly, and no row is padded to more
+    than twice its length. Keys longer than max_width, any other function, or a missing NumPy
+    are hashed one key at a time.
+
+    :params: keys: a sequence (or NumPy string array) of keys
+             function: the hash function of the map the keys are meant for
+             chunk_size: the number of keys grouped and converted at once
+             max_width: the length above which a key is hashed by the scalar function
+
+    :return: a list of the hash of each key, as Python ints
+    """
+    if np is None or (function is not hash_function_1 and function is not hash_function_2):
+        return [function(key) for key in keys]
+
+    widths = []
+    width = 8
+    while width < max_width:
+        widths.append(width)
+        width *= 2
+    widths.append(max_width)
+    widths = np.array(widths)
+
+    hashes = []
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        if not isinstance(chunk, list):
+            chunk = list(chunk)
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        groups = np.searchsorted(widths, lengths)
+        chunk_hashes = np.zeros(len(chunk), dtype=np.int64)
+
+        for group in np.unique(groups).tolist():
+            if group == len(widths):
+                continue
+            positions = np.flatnonzero(groups == group)
+            width = int(widths[group])
+            group_keys = np.array([chunk[i] for i in positions.tolist()], dtype=f'<U{width}')
+
+            # fixed width unicode arrays store one 32 bit code point per character
+            codes = group_keys.view(np.uint32).reshape(positions.size, width).astype(np.int64)
+            if function is hash_function_1:
+                chunk_hashes[positions] = codes.sum(axis=1)
+            else:
+                chunk_hashes[positions] = codes @ np.arange(1, width + 1, dtype=np.int64)
+
+        chunk_hashes = chunk_hashes.tolist()
+        for i in np.flatnonzero(groups == len(widths)).tolist():
+            chunk_hashes[i] = function(chunk[i])
+        hashes.extend(chunk_hashes)
+
+    return hashes
+
+
+def bucket_indices(hashes, capacity: int) -> list:
+    """
+    This function returns the initial bucket index (hash % capacity) of every hash.
+
+    :params: hashes: a sequence of hashes
+             capacity: the capacity of the table
+
+    :return: a list of bucket indices, as Python ints
+    """
+    if np is None:
+        return [hash_val % capacity for hash_val in hashes]
+
+    try:
+        # unsigned, so hashes of 2 ** 63 and above do not wrap around
+        hashes = np.asarray(hashes, dtype=np.uint64)
+    except OverflowError:
+        # negative hashes or hashes of 2 ** 64 and above
+        return [hash_val % capacity for hash_val in hashes]
+    return (hashes % np.uint64(capacity)).tolist()
+
+
+def put_many(hash_map, keys, values) -> None:
+    """
+    This function bulk loads keys and values into a hash_map_oa or hash_map_sc HashMap, hashing
+    the keys in batches with hash_keys() and handing the hashes to the map's put_many().
+
+    :params: hash_map: the map to load
+             keys: a sequence (or NumPy string array) of keys
+             values: a sequence of values, one per key
+
+    :return: None
+    """
+    hashes = hash_keys(keys, hash_map.get_hash_function())
+    if np is not None and isinstance(keys, np.ndarray):
+        keys = keys.tolist()
+    hash_map.put_many(list(zip(keys, values)), hashes)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    keys = ['str' + str(i) for i in range(1000)] + ['', 'a', 'üñî', 'key' * 20, 'x' * 5000]
+    for function in (hash_function_1, hash_function_2):
+        print(function.__name__, hash_keys(keys, function, chunk_size=100) == [function(key) for key in keys])
+    print(bucket_indices(hash_keys(keys[:5], hash_function_2), 11))
+    big = [2 ** 63 + 5, 2 ** 64 - 1, 7]
+    print(bucket_indices(big, 11) == [hash_val % 11 for hash_val in big],
+          bucket_indices([2 ** 70, -3], 11) == [2 ** 70 % 11, -3 % 11])
@@ -0,0 +1,577 @@
+# Name: Simran Bapla
+# OSU Email: baplas@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Due Date: Dec 2, 2022
+# Description: Durable mode of the hash maps: an append only write ahead log of every change
+#              with group commit, compacted snapshots, and recovery of a map from both
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from hash_map_mmap import MappedHashMap, _sync_directory, write_map
+
+# Log layout, all integers little endian:
+#
+#   header  magic b'HWAL', format version (u32)
+#   records CRC-32 of the rest of the record (u32), operation (u8), key length (u32), value
+#           length (u32), the UTF-8 key, the pickled value (empty for remove and clear)
+#
+# A record cut short by a crash, or one whose CRC does not match, ends the log: recovery keeps
+# the records before it and truncates the file there.
+_MAGIC = b'HWAL'
+_VERSION = 1
+_HEADER = struct.Struct('<4sI')
+_CRC = struct.Struct('<I')
+_FIELDS = struct.Struct('<BII')
+
+_PUT = 1
+_REMOVE = 2
+_CLEAR = 3
+
+SYNC_POLICIES = ('always', 'batch', 'never')
+
+
+def _read_log(path: str) -> (list, int):
+    """
+    This function reads the records of a log file, stopping at the first incomplete or
+    corrupt one.
+
+    :params: path: the path of the log file
+
+    :return: a tuple of the list of (operation, key, value bytes) records and the length of
+             the valid part of the file
+    """
+    with open(path, 'rb') as log_file:
+        data = log_file.read()
+    if len(data) < _HEADER.size:
+        return [], 0
+
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a write ahead log of format version {_VERSION}")
+
+    records = []
+    offset = _HEADER.size
+    record_start = _CRC.size + _FIELDS.size
+    while offset + record_start <= len(data):
+        crc = _CRC.unpack_from(data, offset)[0]
+        op, key_length, value_length = _FIELDS.unpack_from(data, offset + _CRC.size)
+        key_start = offset + record_start
+        value_start = key_start + key_length
+        end = value_start + value_length
+        if end > len(data) or zlib.crc32(data[offset + _CRC.size:end]) != crc:
+            break
+        records.append((op, str(data[key_start:value_start], 'utf-8'), data[value_start:end]))
+        offset = end
+
+    return records, offset
+
+
+class WriteAheadLog:
+    def __init__(self, path: str, sync: str = 'batch', group_size: int = 256,
+                 group_seconds: float = 0.01, compact_ratio: float = 2.0,
+                 compact_min_bytes: int = 1 << 20) -> None:
+        """
+        Initialize the write ahead log of a durable hash map. The log itself is kept at path
+        and the latest snapshot of the map at path + '.snapshot'. Pass the log (or just a path)
+        as the durable option of hash_map_sc.HashMap or hash_map_oa.HashMap; the map then
+        recovers its contents from both files and logs every change it makes from then on.
+
+        Records are collected in memory and written in groups. sync picks when a group is
+        written and made durable:
+            'always'  at the end of every operation, fsync included, so a change is on disk
+                      before the method that made it returns
+            'batch'   group commit: once group_size records are waiting, or group_seconds
+                      after the oldest one was logged, with one fsync for the whole group; a
+                      background thread commits a group whose time is up even if no further
+                      change arrives, so a crash loses at most the changes of the last
+                      group_seconds
+            'never'   on the same schedule as 'batch' but without fsync, leaving the flush to
+                      the operating system
+
+        Once the log has grown past compact_min_bytes and past compact_ratio times the size of
+        the last snapshot, the map is written out as a new snapshot and the log starts over.
+        compact_ratio trades write amplification (every snapshot rewrites the whole map) for
+        recovery time (every record of the log is replayed on recovery).
+        """
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"unknown sync policy {sync!r}, expected one of {SYNC_POLICIES}")
+
+        self.path = path
+        self.snapshot_path = path + '.snapshot'
+        self._sync = sync
+        self._group_size = group_size
+        self._group_seconds = group_seconds
+        self._compact_ratio = compact_ratio
+        self._compact_min_bytes = compact_min_bytes
+
+        self._map = None
+        self._file = None
+        self._buffer = bytearray()
+        self._pending = 0
+        self._group_start = 0.0
+
+        # guards the buffer and the file against the thread committing groups whose time is up
+        self._condition = threading.Condition(threading.RLock())
+        self._flusher = None
+
+        # sizes of the files as they are now
+        self._log_size = 0
+        self._snapshot_size = 0
+        if os.path.exists(self.snapshot_path):
+            self._snapshot_size = os.path.getsize(self.snapshot_path)
+
+        # counters for stats()
+        self._records = 0
+        self._payload_bytes = 0
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        self._fsyncs = 0
+        self._snapshots = 0
+        self._recovery_seconds = 0.0
+        self._recovered_records = 0
+
+    def stats(self) -> dict:
+        """
+        This method returns the activity of the log since it was opened.
+
+        :params:
+
+        :return: a dict of records (logged), payload_bytes (the keys and values they carried),
+                 log_bytes and snapshot_bytes (written to disk), write_amplification (bytes
+                 written per payload byte), fsyncs, snapshots, log_size and snapshot_size (of the
+                 files now), recovered_records (replayed from the log tail) and
+                 recovery_seconds
+        """
+        written = self._log_bytes + self._snapshot_bytes
+        amplification = written / self._payload_bytes if self._payload_bytes > 0 else 0.0
+        return {
+            'records': self._records,
+            'payload_bytes': self._payload_bytes,
+            'log_bytes': self._log_bytes,
+            'snapshot_bytes': self._snapshot_bytes,
+            'write_amplification': amplification,
+            'fsyncs': self._fsyncs,
+            'snapshots': self._snapshots,
+            'log_size': self._log_size,
+            'snapshot_size': self._snapshot_size,
+            'recovered_records': self._recovered_records,
+            'recovery_seconds': self._recovery_seconds,
+        }
+
+    # ------------------------------------------------------------------ #
+
+    def attach(self, hash_map) -> None:
+        """
+        This method recovers the contents of the files into the given empty map and makes the
+        map log every change from then on.
+
+        The snapshot is bulk loaded with put_many() and the hashes stored in it, so no key is
+        hashed again; the hash function must therefore return hashes between 0 and 2 ** 64 as
+        both assignment functions do. The table is sized once, up front, for the snapshot and
+        every put of the log tail, which is then replayed in runs of puts through put_many().
+        A clear in the tail makes the snapshot and every record before it irrelevant, so they
+        are skipped.
+
+        :params: hash_map: a new hash_map_sc or hash_map_oa HashMap
+
+        :return: None
+        """
+        if self._map is not None:
+            raise ValueError("the log is already attached to a map")
+
+        start = time.perf_counter()
+        records = self._open_log()
+
+        # nothing before the last clear survives it
+        first = 0
+        for index in range(len(records) - 1, -1, -1):
+            if records[index][0] == _CLEAR:
+                first = index + 1
+                break
+        records = records[first:]
+
+        pairs = []
+        hashes = []
+        if first == 0 and os.path.exists(self.snapshot_path):
+            with MappedHashMap(self.snapshot_path, hash_map.get_hash_function(),
+                               decode='pickle') as snapshot:
+                for entry in snapshot:
+                    pairs.append((entry.key, entry.value))
+                    hashes.append(entry.hash)
+
+        puts = 0
+        for record in records:
+            if record[0] == _PUT:
+                puts += 1
+        hash_map.reserve(len(pairs) + puts)
+        if len(pairs) > 0:
+            hash_map.put_many(pairs, hashes)
+
+        # replay the tail, batching consecutive puts
+        run = []
+        for op, key, value in records:
+            if op == _PUT:
+                run.append((key, pickle.loads(value)))
+            else:
+                if len(run) > 0:
+                    hash_map.put_many(run)
+                    run = []
+                hash_map.remove(key)
+        if len(run) > 0:
+            hash_map.put_many(run)
+
+        self._recovered_records = len(records)
+        self._recovery_seconds = time.perf_counter() - start
+        self._map = hash_map
+        _log_changes(hash_map, self)
+
+        if self._sync != 'always':
+            self._flusher = threading.Thread(target=self._flush_expired_groups, daemon=True)
+            self._flusher.start()
+
+    def _open_log(self) -> list:
+        """
+        This method opens the log file for appending, creating it if it does not exist, and cuts
+        off anything after its last valid record.
+
+        :params:
+
+        :return: the list of (operation, key, value bytes) records of the log
+        """
+        records, valid_length = [], 0
+        if os.path.exists(self.path):
+            records, valid_length = _read_log(self.path)
+
+        self._file = open(self.path, 'r+b' if os.path.exists(self.path) else 'w+b', buffering=0)
+        if valid_length == 0:
+            self._file.truncate(0)
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+            valid_length = _HEADER.size
+            os.fsync(self._file.fileno())
+            _sync_directory(self.path)
+        elif valid_length < os.path.getsize(self.path):
+            self._file.truncate(valid_length)
+            os.fsync(self._file.fileno())
+        self._file.seek(valid_length)
+        self._log_size = valid_length
+        return records
+
+    def _append(self, op: int, key: str, value: object = None) -> None:
+        """
+        This method adds a record to the group waiting to be written.
+
+        :params: op: _PUT, _REMOVE or _CLEAR
+                 key: the key of the record, '' for a clear
+                 value: the value of a put
+
+        :return: None
+        """
+        if self._file is None:
+            raise ValueError("the log is closed")
+
+        key_bytes = key.encode('utf-8')
+        value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL) if op == _PUT else b''
+        fields = _FIELDS.pack(op, len(key_bytes), len(value_bytes))
+        crc = zlib.crc32(value_bytes, zlib.crc32(key_bytes, zlib.crc32(fields)))
+
+        with self._condition:
+            if self._pending == 0:
+                self._group_start = time.monotonic()
+                # the flusher sleeps until a group is waiting
+                self._condition.notify()
+            buffer = self._buffer
+            buffer += _CRC.pack(crc)
+            buffer += fields
+            buffer += key_bytes
+            buffer += value_bytes
+            self._pending += 1
+            self._records += 1
+            self._payload_bytes += len(key_bytes) + len(value_bytes)
+
+    def _flush_expired_groups(self) -> None:
+        """
+        This method runs on the flusher thread of a 'batch' or 'never' log until the log is
+        closed, committing every group once group_seconds have passed since its oldest record.
+
+        :params:
+
+        :return: None
+        """
+        with self._condition:
+            while self._file is not None:
+                if self._pending == 0:
+                    self._condition.wait()
+                    continue
+                remaining = self._group_start + self._group_seconds - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self.commit()
+
+    def log_put(self, key: str, value: object) -> None:
+        """
+        Log that the key now holds the value
+        """
+        self._append(_PUT, key, value)
+
+    def log_remove(self, key: str) -> None:
+        """
+        Log that the key was removed
+        """
+        self._append(_REMOVE, key)
+
+    def log_clear(self) -> None:
+        """
+        Log that the map was cleared
+        """
+        self._append(_CLEAR, '')
+
+    def end_operation(self) -> None:
+        """
+        This method is called by the map after each change it logged. It writes the waiting
+        group if the sync policy says it is due, and compacts the log if it has grown enough.
+
+        :params:
+
+        :return: None
+        """
+        with self._condition:
+            if (self._pending > 0 and
+                    (self._sync == 'always' or self._pending >= self._group_size or
+                     time.monotonic() - self._group_start >= self._group_seconds)):
+                self.commit()
+            # groups committed by the flusher count too, the snapshot is written from here
+            # because only the thread changing the map may read it
+            if (self._log_size >= self._compact_min_bytes and
+                    self._log_size > self._compact_ratio * self._snapshot_size):
+                self.checkpoint()
+
+    def commit(self) -> None:
+        """
+        This method writes the waiting group of records to the log, and makes it durable with
+        one fsync unless the sync policy is 'never'.
+
+        :params:
+
+        :return: None
+        """
+        with self._condition:
+            if len(self._buffer) > 0:
+                self._file.write(self._buffer)
+                self._log_size += len(self._buffer)
+                self._log_bytes += len(self._buffer)
+                self._buffer = bytearray()
+                if self._sync != 'never':
+                    os.fsync(self._file.fileno())
+                    self._fsyncs += 1
+            self._pending = 0
+
+    def checkpoint(self) -> None:
+        """
+        This method writes the whole map as a new snapshot and empties the log.
+
+        The log is committed first, so that until it is emptied it describes everything the new
+        snapshot holds. Replaying a log over a snapshot that already contains its changes gives
+        that snapshot back (the last record of a key, or a later clear, decides what becomes of
+        it), so a crash at any point of the checkpoint recovers correctly.
+
+        :params:
+
+        :return: None
+        """
+        with self._condition:
+            self.commit()
+            write_map(self._map, self.snapshot_path, encode='pickle', sync=True)
+            self._snapshot_size = os.path.getsize(self.snapshot_path)
+            self._snapshot_bytes += self._snapshot_size
+            self._snapshots += 1
+
+            self._file.truncate(_HEADER.size)
+            self._file.seek(_HEADER.size)
+            os.fsync(self._file.fileno())
+            self._fsyncs += 1
+            self._log_size = _HEADER.size
+
+    def close(self) -> None:
+        """
+        This method commits the waiting records and closes the log file. The map can still be
+        read afterwards, but any change to it raises ValueError.
+
+        :params:
+
+        :return: None
+        """
+        with self._condition:
+            if self._file is None:
+                return
+            if self._sync == 'never':
+                self._sync = 'batch'
+            self.commit()
+            self._file.close()
+            self._file = None
+            self._condition.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+
+
+def _log_changes(hash_map, log: WriteAheadLog) -> None:
+    """
+    This function wraps the methods of the given map that change it, so each change is logged
+    after it is made and before the method returns. The wrappers are attributes of the
+    instance, so maps that are not durable run exactly the code they did before.
+
+    :params: hash_map: the map to log
+             log: the log to record into
+
+    :returns: None
+    """
+    # put() and remove() go through these, as do writes that come with the hash of their key
+    put_hashed = hash_map._put_hashed
+    put_many = hash_map.put_many
+    merge_from = hash_map.merge_from
+    remove_hashed = hash_map._remove_hashed
+    remove_many = hash_map.remove_many
+    clear = hash_map.clear
+
+    def logged_put_hashed(key, value, hash_val):
+        put_hashed(key, value, hash_val)
+        log.log_put(key, value)
+        log.end_operation()
+
+    def logged_put_many(pairs, hashes=None):
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        put_many(pairs, hashes)
+        for key, value in pairs:
+            log.log_put(key, value)
+        log.end_operation()
+
+    def logged_merge_from(*others):
+        moved = [(entry.key, entry.value) for other in others for entry in other]
+        merge_from(*others)
+        for key, value in moved:
+            log.log_put(key, value)
+        log.end_operation()
+
+    def logged_remove_hashed(key, hash_val):
+        size = hash_map.get_size()
+        remove_hashed(key, hash_val)
+        # removing a missing key changes nothing worth logging
+        if hash_map.get_size() != size:
+            log.log_remove(key)
+            log.end_operation()
+
+    def logged_remove_many(keys):
+        present = [key for key in keys if hash_map.contains_key(key)]
+        remove_many(present)
+        for key in present:
+            log.log_remove(key)
+        log.end_operation()
+
+    def logged_clear():
+        clear()
+        log.log_clear()
+        log.end_operation()
+
+    hash_map._put_hashed = logged_put_hashed
+    hash_map.put_many = logged_put_many
+    hash_map.merge_from = logged_merge_from
+    hash_map._remove_hashed = logged_remove_hashed
+    hash_map.remove_many = logged_remove_many
+    hash_map.clear = logged_clear
+
+    # the open addressing map also writes through these
+    if hasattr(hash_map, 'get_or_insert'):
+        get_or_insert = hash_map.get_or_insert
+        update_with = hash_map.update_with
+
+        def logged_get_or_insert(key, factory):
+            size = hash_map.get_size()
+            value = get_or_insert(key, factory)
+            if hash_map.get_size() != size:
+                log.log_put(key, value)
+                log.end_operation()
+            return value
+
+        def logged_update_with(key, fn):
+            value = update_with(key, fn)
+            log.log_put(key, value)
+            log.end_operation()
+            return value
+
+        hash_map.get_or_insert = logged_get_or_insert
+        hash_map.update_with = logged_update_with
+
+
+def make_durable(hash_map, durable) -> WriteAheadLog:
+    """
+    This function attaches a write ahead log to a new map, recovering its contents first.
+
+    :params: hash_map: a new hash_map_sc or hash_map_oa HashMap
+             durable: a WriteAheadLog, or the path of one to open with the default settings
+
+    :return: the attached log
+    """
+    log = WriteAheadLog(durable) if isinstance(durable, str) else durable
+    log.attach(hash_map)
+    return log
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    import hash_map_oa
+    import hash_map_sc
+    from a6_include import hash_function_2
+
+    for map_class, options in ((hash_map_sc.HashMap, {}),
+                               (hash_map_oa.HashMap, {'probing': 'double'})):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'map.wal')
+            log = WriteAheadLog(path, group_size=64, compact_min_bytes=1 << 16)
+            m = map_class(11, hash_function_2, durable=log, **options)
+            for i in range(20000):
+                m.put('key' + str(i % 6000), i)
+                if i % 7 == 0:
+                    m.remove('key' + str(i % 3000))
+            m.remove_many(['key' + str(i) for i in range(10)])
+            log.close()
+            expected = sorted(m.items())
+
+            # a torn record at the end is dropped on recovery
+            with open(path, 'ab') as log_file:
+                log_file.write(b'\x00\x01\x02')
+
+            m2 = map_class(11, hash_function_2, durable=path, **options)
+            stats = m2.get_wal().stats()
+            print(map_class.__module__, m2.get_size(), sorted(m2.items()) == expected,
+                  log.stats()['snapshots'], round(log.stats()['write_amplification'], 2),
+                  stats['recovered_records'])
+            m2.clear()
+            m2.put('after', 'clear')
+            m2.get_wal().close()
+
+            m3 = map_class(11, hash_function_2, durable=path, **options)
+            print(map_class.__module__, sorted(m3.items()))
+            m3.get_wal().close()
+
+    # a group is committed once group_seconds pass, even if no further change arrives
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'map.wal')
+        log = WriteAheadLog(path, group_seconds=0.05)
+        m = hash_map_sc.HashMap(11, hash_function_2, durable=log)
+        m.put('lonely', 1)
+        before = os.path.getsize(path)
+        time.sleep(0.5)
+        print('timed commit', os.path.getsize(path) > before, log.stats()['fsyncs'] >= 1)
+        log.close()